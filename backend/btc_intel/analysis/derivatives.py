@@ -1,5 +1,6 @@
 """Derivatives Analysis — Funding Rate & Open Interest classification."""
 
+from bisect import bisect_left
 from datetime import date, timedelta
 
 from rich.console import Console
@@ -8,6 +9,16 @@ from btc_intel.db import get_supabase
 
 console = Console()
 
+# Funding rate (%) bounds and the label for each band between them
+_FUNDING_BOUNDS = (-0.05, -0.03, 0.03, 0.1)
+_FUNDING_LABELS = (
+    "extreme_bullish",  # Extreme shorts, contrarian buy signal
+    "bullish",  # Market leaning short, contrarian
+    "neutral",
+    "bearish",  # Market leaning long
+    "extreme_bearish",  # Extreme longs, contrarian sell signal
+)
+
 
 def analyze_derivatives():
     """Classify funding rate and compute OI signal vs 30d average."""
@@ -69,16 +80,9 @@ def classify_funding_rate(rate_pct: float) -> str:
 
     High positive funding = everyone is long = contrarian bearish.
     High negative funding = everyone is short = contrarian bullish.
+    Bounds are exclusive: a rate equal to a bound gets the lower label.
     """
-    if rate_pct > 0.1:
-        return "extreme_bearish"  # Extreme longs, contrarian sell signal
-    if rate_pct > 0.03:
-        return "bearish"  # Market leaning long
-    if rate_pct > -0.03:
-        return "neutral"
-    if rate_pct > -0.05:
-        return "bullish"  # Market leaning short, contrarian
-    return "extreme_bullish"  # Extreme shorts, contrarian buy signal
+    return _FUNDING_LABELS[bisect_left(_FUNDING_BOUNDS, rate_pct)]
 
 
 def classify_open_interest_change(current: float, avg_30d: float) -> str:
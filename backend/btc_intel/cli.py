@@ -21,6 +21,18 @@ def _run(coro):
     return asyncio.get_event_loop().run_until_complete(coro)
 
 
+def _update(coro):
+    """Run an updater coroutine, then drop context caches built from older data."""
+    from btc_intel.context.cache import bump_version
+    from btc_intel.context.formatters import invalidate_analyses
+
+    try:
+        return _run(coro)
+    finally:
+        invalidate_analyses()
+        bump_version()
+
+
 def handle_errors(func):
     """Decorator wrapping CLI commands with robust error handling."""
     @functools.wraps(func)
@@ -131,9 +143,9 @@ def update_data(
     from btc_intel.data.updater import update_all, update_only
 
     if only:
-        _run(update_only(only))
+        _update(update_only(only))
     else:
-        _run(update_all())
+        _update(update_all())
 
 
 @app.command(name="seed-events")
@@ -158,8 +170,13 @@ def seed_all():
     """Load all seeds (events + cycles)."""
     from btc_intel.data.events_seed import seed_events as _seed_events
     from btc_intel.data.cycles_seed import seed_cycles as _seed_cycles
-    _seed_events()
-    _seed_cycles()
+
+    async def _seed_both():
+        await asyncio.gather(
+            asyncio.to_thread(_seed_events), asyncio.to_thread(_seed_cycles),
+        )
+
+    _run(_seed_both())
 
 
 @app.command()
@@ -331,7 +348,7 @@ def morning():
     console.print("[bold cyan]═══ MORNING ROUTINE ═══[/bold cyan]\n")
 
     console.print("[bold]1/4 Updating data...[/bold]")
-    _run(update_all())
+    _update(update_all())
 
     console.print("\n[bold]2/4 Running analysis...[/bold]")
     for name, func in [
@@ -371,7 +388,7 @@ def weekly():
     console.print("[bold cyan]═══ WEEKLY ROUTINE ═══[/bold cyan]\n")
 
     console.print("[bold]1/5 Updating data...[/bold]")
-    _run(update_all())
+    _update(update_all())
 
     console.print("\n[bold]2/5 Running analysis...[/bold]")
     for name, func in [
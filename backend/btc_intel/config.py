@@ -14,6 +14,9 @@ class Settings(BaseSettings):
     supabase_anon_key: str = ""
     fred_api_key: str = ""
     anthropic_api_key: str = ""
+    # Direct Postgres connection string (service role). Optional: only used
+    # with asyncpg for bulk backfills; PostgREST handles everything else.
+    database_url: str = ""
 
     # FastAPI
     api_host: str = "0.0.0.0"
@@ -21,6 +24,9 @@ class Settings(BaseSettings):
 
     # Data
     data_dir: Path = Path(__file__).resolve().parent.parent / "data"
+    # Raw upstream downloads are reused for this long. Dev opt-in only: the
+    # default 0 keeps scheduled updates from reading stale payloads.
+    cache_ttl_hours: float = 0
 
     model_config = {
         "env_file": str(_env_path),
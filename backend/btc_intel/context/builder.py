@@ -1,8 +1,11 @@
 """Context Builder — Generates structured context for Claude Code."""
 
+import io
 from datetime import date, timedelta
 
 from btc_intel.db import get_supabase
+from btc_intel.context.cache import ttl_cache
+from btc_intel.context.snapshot import load_snapshot, submit
 from btc_intel.context.formatters import (
     format_price_section,
     format_cycle_score_section,
@@ -20,143 +23,181 @@ from btc_intel.context.formatters import (
     format_compare_section,
 )
 
+# Whole renders are memoized like the sections they are made of
+_RENDER_TTL = 300
+
+
 def build_context(scope: str = "summary", area: str | None = None,
                   period1: str | None = None, period2: str | None = None) -> str:
-    """Main entry point. Builds context based on scope."""
+    """Main entry point. Builds context based on scope.
+
+    Routines that print a briefing and then store it as a report render it
+    once: repeated calls within a few minutes are served from the context
+    cache until new data lands (bump_version).
+    """
+    # Single as-of date for the whole render so sections never straddle midnight
+    return _render(get_supabase(), scope, area, period1, period2, as_of=date.today())
+
+
+@ttl_cache(_RENDER_TTL)
+def _render(db, scope: str, area: str | None, period1: str | None, period2: str | None,
+            as_of: date) -> str:
     if scope == "summary":
-        return _build_summary()
+        return _build_summary(db, as_of)
     elif scope == "morning":
-        return _build_morning()
+        return _build_morning(db, as_of)
     elif scope == "deep":
-        return _build_deep(area or "technical")
+        return _build_deep(db, area or "technical", as_of)
     elif scope == "compare":
-        return _build_compare(period1, period2)
+        return _build_compare(db, period1, period2, as_of)
     else:
         return f"Unknown scope: {scope}"
 
 
-def _build_summary() -> str:
+def _build_summary(db, today: date) -> str:
     """Summary: ~500-800 tokens. Quick view of current state."""
-    db = get_supabase()
-    sections = []
+    # Sections with their own queries start first and overlap with the snapshot fetch
+    confluences = submit(format_confluences_section, db, as_of=today)
+    conclusions = submit(format_conclusions_section, db, limit=3)
+    snapshot = load_snapshot(db)
+    out = io.StringIO()
 
-    sections.append("# BTC Intelligence Hub — Summary\n")
-    sections.append(f"Date: {date.today()}\n")
+    _emit(out, "# BTC Intelligence Hub — Summary\n")
+    _emit(out, f"Date: {today}\n")
 
     # Price
-    sections.append(format_price_section(db))
+    _emit(out, format_price_section(db, snapshot=snapshot))
 
     # Cycle Score
-    sections.append(format_cycle_score_section(db))
+    _emit(out, format_cycle_score_section(db, snapshot=snapshot))
 
     # Area signals (1 line each)
-    sections.append("## Signals by Area\n")
-    sections.append(format_technical_section(db, brief=True))
-    sections.append(format_onchain_section(db, brief=True))
-    sections.append(format_macro_section(db, brief=True))
-    sections.append(format_sentiment_section(db, brief=True))
+    _emit(out, "## Signals by Area\n")
+    _emit(out, format_technical_section(db, brief=True, snapshot=snapshot))
+    _emit(out, format_onchain_section(db, brief=True, snapshot=snapshot))
+    _emit(out, format_macro_section(db, brief=True, snapshot=snapshot))
+    _emit(out, format_sentiment_section(db, brief=True, snapshot=snapshot))
 
     # Confluences
-    sections.append(format_confluences_section(db))
+    _emit(out, confluences.result())
 
     # Active alerts
-    sections.append(format_alerts_section(db))
+    _emit(out, format_alerts_section(db, snapshot=snapshot))
 
     # Recent conclusions
-    sections.append(format_conclusions_section(db, limit=3))
+    _emit(out, conclusions.result())
 
-    return "\n".join(s for s in sections if s)
+    return out.getvalue()
 
 
-def _build_morning() -> str:
+def _build_morning(db, today: date) -> str:
     """Morning: ~1500 tokens. Everything from summary + changes and events."""
-    db = get_supabase()
-    sections = []
-
-    sections.append("# BTC Intelligence Hub — Morning Briefing\n")
-    sections.append(f"Date: {date.today()}\n")
+    # Sections with their own queries start first and overlap with the snapshot fetch
+    changes = submit(format_signal_changes, db, as_of=today)
+    events = submit(format_events_section, db, as_of=today)
+    confluences = submit(format_confluences_section, db, as_of=today)
+    conclusions = submit(format_conclusions_section, db, limit=5)
+    risk = submit(format_risk_section, db, as_of=today)
+    snapshot = load_snapshot(db)
+    out = io.StringIO()
+
+    _emit(out, "# BTC Intelligence Hub — Morning Briefing\n")
+    _emit(out, f"Date: {today}\n")
 
     # Price
-    sections.append(format_price_section(db))
+    _emit(out, format_price_section(db, snapshot=snapshot))
 
     # Cycle Score
-    sections.append(format_cycle_score_section(db))
+    _emit(out, format_cycle_score_section(db, snapshot=snapshot))
 
     # Signals by area
-    sections.append("## Signals by Area\n")
-    sections.append(format_technical_section(db, brief=True))
-    sections.append(format_onchain_section(db, brief=True))
-    sections.append(format_macro_section(db, brief=True))
-    sections.append(format_sentiment_section(db, brief=True))
+    _emit(out, "## Signals by Area\n")
+    _emit(out, format_technical_section(db, brief=True, snapshot=snapshot))
+    _emit(out, format_onchain_section(db, brief=True, snapshot=snapshot))
+    _emit(out, format_macro_section(db, brief=True, snapshot=snapshot))
+    _emit(out, format_sentiment_section(db, brief=True, snapshot=snapshot))
 
     # Changes since yesterday
-    sections.append(format_signal_changes(db))
+    _emit(out, changes.result())
 
     # Upcoming events
-    sections.append(format_events_section(db))
+    _emit(out, events.result())
 
     # Confluences
-    sections.append(format_confluences_section(db))
+    _emit(out, confluences.result())
 
     # Detailed alerts
-    sections.append(format_alerts_section(db, detailed=True))
+    _emit(out, format_alerts_section(db, detailed=True, snapshot=snapshot))
 
     # Recent conclusions
-    sections.append(format_conclusions_section(db, limit=5))
+    _emit(out, conclusions.result())
 
     # Risk
-    sections.append(format_risk_section(db))
+    _emit(out, risk.result())
 
-    return "\n".join(s for s in sections if s)
+    return out.getvalue()
 
 
-def _build_deep(area: str) -> str:
+def _build_deep(db, area: str, today: date) -> str:
     """Deep: ~2000-3000 tokens. Full detail of an area."""
-    db = get_supabase()
-    sections = []
-
-    sections.append(f"# BTC Intelligence Hub — Deep: {area.upper()}\n")
-    sections.append(f"Date: {date.today()}\n")
-
-    # Price as reference
-    sections.append(format_price_section(db))
-
     area_map = {
         "technical": lambda: format_technical_section(db, brief=False),
         "onchain": lambda: format_onchain_section(db, brief=False),
         "macro": lambda: format_macro_section(db, brief=False),
         "sentiment": lambda: format_sentiment_section(db, brief=False),
-        "cycle": lambda: format_cycles_section(db),
+        "cycle": lambda: format_cycles_section(db, as_of=today),
     }
 
-    if area in area_map:
-        sections.append(area_map[area]())
+    # Every section is independent: fetch them all concurrently
+    price = submit(format_price_section, db)
+    detail = submit(area_map[area]) if area in area_map else None
+    cycle_score = submit(format_cycle_score_section, db)
+    risk = submit(format_risk_section, db, as_of=today)
+    conclusions = submit(format_conclusions_section, db, limit=5, category=area)
+    out = io.StringIO()
+
+    _emit(out, f"# BTC Intelligence Hub — Deep: {area.upper()}\n")
+    _emit(out, f"Date: {today}\n")
+
+    # Price as reference
+    _emit(out, price.result())
+
+    if detail is not None:
+        _emit(out, detail.result())
     else:
-        sections.append(f"Unknown area: {area}")
+        _emit(out, f"Unknown area: {area}")
 
     # Cycle Score
-    sections.append(format_cycle_score_section(db))
+    _emit(out, cycle_score.result())
 
     # Risk
-    sections.append(format_risk_section(db))
+    _emit(out, risk.result())
 
     # Area conclusions
-    sections.append(format_conclusions_section(db, limit=5, category=area))
+    _emit(out, conclusions.result())
 
-    return "\n".join(s for s in sections if s)
+    return out.getvalue()
 
 
-def _build_compare(period1: str | None, period2: str | None) -> str:
+def _build_compare(db, period1: str | None, period2: str | None, today: date) -> str:
     """Compare: ~3000 tokens. Two periods side by side."""
-    db = get_supabase()
-    sections = []
+    out = io.StringIO()
+
+    p1 = period1 or str(today - timedelta(days=30))
+    p2 = period2 or str(today)
+
+    _emit(out, f"# BTC Intelligence Hub — Comparison\n")
+    _emit(out, f"Period 1: {p1} | Period 2: {p2}\n")
 
-    p1 = period1 or str(date.today() - timedelta(days=30))
-    p2 = period2 or str(date.today())
+    _emit(out, format_compare_section(db, p1, p2))
 
-    sections.append(f"# BTC Intelligence Hub — Comparison\n")
-    sections.append(f"Period 1: {p1} | Period 2: {p2}\n")
+    return out.getvalue()
 
-    sections.append(format_compare_section(db, p1, p2))
 
-    return "\n".join(s for s in sections if s)
+def _emit(out: io.StringIO, section: str) -> None:
+    """Append a non-empty section to the render buffer, newline-separated."""
+    if not section:
+        return
+    if out.tell():
+        out.write("\n")
+    out.write(section)
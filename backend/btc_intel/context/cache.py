@@ -0,0 +1,73 @@
+"""Context Cache — Short-lived memo of rendered sections and snapshots.
+
+The cache lives in process memory. bump_version() only reaches the process
+that calls it, so a CLI update does not invalidate a running API server:
+there, the TTL is what bounds staleness. Keep TTLs short for anything that
+reads today's rows.
+"""
+
+import functools
+import threading
+import time
+from datetime import date
+
+# (version, fn name, day, args, kwargs) -> (expires_at, value)
+_CACHE: dict[tuple, tuple[float, object]] = {}
+# Sections render concurrently on the snapshot executor: every read, eviction
+# and write of _CACHE holds this lock (the wrapped fn runs outside it)
+_lock = threading.Lock()
+
+# Bumped by the CLI after data updates; entries from older versions never match
+_version = 0
+
+
+def bump_version() -> None:
+    """Invalidate every cached entry of this process. Call after new rows land."""
+    global _version
+    with _lock:
+        _version += 1
+        _CACHE.clear()
+
+
+def _evict_expired(now: float) -> None:
+    """Drop expired entries so keys for past days and args do not pile up.
+
+    Caller holds _lock.
+    """
+    for key in [k for k, (expires_at, _) in _CACHE.items() if expires_at <= now]:
+        del _CACHE[key]
+
+
+def ttl_cache(seconds: float):
+    """Memoize a ``fn(db, ...)`` reader for ``seconds``, per day and data version.
+
+    The ``db`` client is not part of the key (there is one per process).
+    Calls that pass a prefetched ``snapshot`` bypass the cache: they do no
+    I/O, and snapshots are not hashable.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(db, *args, **kwargs):
+            if kwargs.get("snapshot") is not None:
+                return fn(db, *args, **kwargs)
+            kwargs.pop("snapshot", None)
+
+            day = kwargs.get("as_of") or date.today()
+            with _lock:
+                key = (_version, fn.__name__, day, args, tuple(sorted(kwargs.items())))
+                now = time.monotonic()
+                hit = _CACHE.get(key)
+            if hit is not None and hit[0] > now:
+                return hit[1]
+
+            value = fn(db, *args, **kwargs)
+            with _lock:
+                _evict_expired(now)
+                # A bump_version() during fn means value may predate new data
+                if key[0] == _version:
+                    _CACHE[key] = (now + seconds, value)
+            return value
+
+        return wrapper
+
+    return decorator
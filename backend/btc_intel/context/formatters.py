@@ -1,67 +1,180 @@
 """Formatters — Converts Supabase data into readable text."""
 
+import io
+from bisect import bisect_left
 from datetime import date, timedelta
+from functools import partial
+
+from postgrest.exceptions import APIError
+
+from btc_intel.db import MISSING_RELATION, call_rpc
+from btc_intel.context.cache import ttl_cache
+from btc_intel.context.snapshot import (
+    ALERT_COLUMNS,
+    CHANGE_INDICATORS,
+    MACRO_PAIRS_30D,
+    MACRO_PAIRS_90D,
+    ONCHAIN_METRICS,
+    SENTIMENT_METRICS,
+    TECH_INDICATORS,
+    ContextSnapshot,
+    gather,
+    latest_by_key,
+    latest_indicators,
+)
+
+
+def _today_strs(as_of: date | None = None) -> tuple[str, str, str]:
+    """ISO strings for (today, yesterday, today + 7d) relative to ``as_of``."""
+    d = as_of or date.today()
+    return (
+        d.isoformat(),
+        (d - timedelta(days=1)).isoformat(),
+        (d + timedelta(days=7)).isoformat(),
+    )
 
-def format_price_section(db) -> str:
+
+# Section renders are reused for a few minutes. Comparisons share the TTL:
+# one end is usually today, whose rows change until the day closes.
+_SECTION_TTL = 300
+
+_PHASE_LABELS = {
+    "capitulation": "CAPITULATION",
+    "accumulation": "ACCUMULATION",
+    "early_bull": "EARLY BULL",
+    "mid_bull": "MID BULL",
+    "late_bull": "LATE BULL",
+    "distribution": "DISTRIBUTION",
+    "euphoria": "EUPHORIA",
+}
+
+# Upper-cased display labels for alert severities and confluence types
+_SEVERITY_LABELS = {"info": "INFO", "warning": "WARNING", "critical": "CRITICAL"}
+_CONFLUENCE_LABELS = {
+    "bullish_confluence": "BULLISH_CONFLUENCE",
+    "bearish_confluence": "BEARISH_CONFLUENCE",
+    "divergence": "DIVERGENCE",
+}
+
+# Correlation strength buckets: |r| <= 0.3 weak, <= 0.6 moderate, above that strong
+_CORR_THRESHOLDS = (0.3, 0.6)
+_CORR_STRENGTH = ("weak", "moderate", "strong")
+
+# Fear & Greed label for every index value 0-100
+_FG_LABELS = tuple(
+    "Extreme Fear" if i <= 20 else
+    "Fear" if i <= 40 else
+    "Neutral" if i <= 60 else
+    "Greed" if i <= 80 else
+    "Extreme Greed"
+    for i in range(101)
+)
+
+# Direction of each signal label written by the analysis modules
+_SIGNAL_DIRECTION = {
+    "extreme_bullish": 1, "strong_bullish": 1, "bullish": 1,
+    "extreme_bearish": -1, "strong_bearish": -1, "bearish": -1,
+}
+
+
+# Results of the heavy analysis delegates (risk, cycles, confluences), memoized
+# per as-of day. They depend only on the DB state, so the CLI update commands call
+# invalidate_analyses() whenever new data lands.
+_ANALYSIS_CACHE: dict[tuple[str, date], dict] = {}
+
+
+def _cached_analysis(name: str, fn, as_of: date | None = None) -> dict:
+    """Run ``fn()`` at most once per (name, day). Exceptions are not cached."""
+    day = as_of or date.today()
+    key = (name, day)
+    result = _ANALYSIS_CACHE.get(key)
+    if result is None:
+        result = fn()
+        # Sections render on worker threads: snapshot the keys before pruning
+        for stale in list(_ANALYSIS_CACHE):
+            if stale[1] != day:
+                _ANALYSIS_CACHE.pop(stale, None)
+        _ANALYSIS_CACHE[key] = result
+    return result
+
+
+def invalidate_analyses() -> None:
+    """Drop memoized analysis results so the next render recomputes them."""
+    _ANALYSIS_CACHE.clear()
+
+
+def _latest_rows(db, prefetched: dict[str, dict] | None, table: str, key_col: str,
+                 cols: str, keys: list[str]) -> dict[str, dict]:
+    """Latest row per key, in ``keys`` order, from a snapshot slice or the DB."""
+    if prefetched is None and table == "technical_indicators":
+        prefetched = latest_indicators(db, keys)
+    if prefetched is not None:
+        return {k: prefetched[k] for k in keys if k in prefetched}
+
+    # Query builders mutate in place, so each key gets its own
+    results = gather([
+        db.table(table).select(cols).eq(key_col, key).order("date", desc=True).limit(1).execute
+        for key in keys
+    ])
+    return {key: res.data[0] for key, res in zip(keys, results) if res.data}
+
+
+@ttl_cache(_SECTION_TTL)
+def format_price_section(db, snapshot: ContextSnapshot | None = None) -> str:
     """Current price + 24h/7d/30d changes."""
-    prices = (
-        db.table("btc_prices")
-        .select("date,close")
-        .order("date", desc=True)
-        .limit(31)
-        .execute()
-    )
-    if not prices.data:
+    if snapshot is not None:
+        prices = snapshot.prices
+    else:
+        prices = (
+            db.table("btc_prices")
+            .select("date,close")
+            .order("date", desc=True)
+            .limit(31)
+            .execute()
+        ).data
+    if not prices:
         return "## Price\nNo price data.\n"
 
-    current = float(prices.data[0]["close"])
-    current_date = prices.data[0]["date"]
+    current = float(prices[0]["close"])
+    current_date = prices[0]["date"]
 
     changes = {}
     for label, days in [("24h", 1), ("7d", 7), ("30d", 30)]:
-        if len(prices.data) > days:
-            prev = float(prices.data[days]["close"])
+        if len(prices) > days:
+            prev = float(prices[days]["close"])
             pct = (current - prev) / prev * 100
             changes[label] = f"{pct:+.2f}%"
         else:
             changes[label] = "N/A"
 
-    lines = [
-        "## BTC Price",
-        f"- Current: **${current:,.2f}** ({current_date})",
-        f"- Change 24h: {changes['24h']} | 7d: {changes['7d']} | 30d: {changes['30d']}",
-        "",
-    ]
-    return "\n".join(lines)
+    return (
+        f"## BTC Price\n"
+        f"- Current: **${current:,.2f}** ({current_date})\n"
+        f"- Change 24h: {changes['24h']} | 7d: {changes['7d']} | 30d: {changes['30d']}\n"
+    )
 
 
-def format_cycle_score_section(db) -> str:
+@ttl_cache(_SECTION_TTL)
+def format_cycle_score_section(db, snapshot: ContextSnapshot | None = None) -> str:
     """Cycle Score + current phase."""
-    cs = (
-        db.table("cycle_score_history")
-        .select("date,score,phase")
-        .order("date", desc=True)
-        .limit(2)
-        .execute()
-    )
-    if not cs.data:
+    if snapshot is not None:
+        cs = snapshot.cycle
+    else:
+        cs = (
+            db.table("cycle_score_history")
+            .select("date,score,phase")
+            .order("date", desc=True)
+            .limit(2)
+            .execute()
+        ).data
+    if not cs:
         return "## Cycle Score\nNo data.\n"
 
-    current = cs.data[0]
-    prev_score = cs.data[1]["score"] if len(cs.data) > 1 else None
+    current = cs[0]
+    prev_score = cs[1]["score"] if len(cs) > 1 else None
     delta = f" ({current['score'] - prev_score:+d})" if prev_score is not None else ""
 
-    phase_labels = {
-        "capitulation": "CAPITULATION",
-        "accumulation": "ACCUMULATION",
-        "early_bull": "EARLY BULL",
-        "mid_bull": "MID BULL",
-        "late_bull": "LATE BULL",
-        "distribution": "DISTRIBUTION",
-        "euphoria": "EUPHORIA",
-    }
-
-    phase_label = phase_labels.get(current["phase"], current["phase"].upper())
+    phase_label = _PHASE_LABELS.get(current["phase"]) or current["phase"].upper()
 
     return (
         f"## Cycle Score\n"
@@ -69,72 +182,69 @@ def format_cycle_score_section(db) -> str:
     )
 
 
-def format_technical_section(db, brief: bool = True) -> str:
+@ttl_cache(_SECTION_TTL)
+def format_technical_section(db, brief: bool = True,
+                             snapshot: ContextSnapshot | None = None) -> str:
     """Technical indicators."""
-    indicators = {}
-    for ind in ["RSI_14", "MACD", "SMA_CROSS", "BB_UPPER", "BB_LOWER", "ATR_14"]:
-        res = (
-            db.table("technical_indicators")
-            .select("indicator,value,signal")
-            .eq("indicator", ind)
-            .order("date", desc=True)
-            .limit(1)
-            .execute()
-        )
-        if res.data:
-            indicators[ind] = res.data[0]
+    indicators = _latest_rows(
+        db, snapshot.tech if snapshot else None,
+        "technical_indicators", "indicator", "indicator,value,signal", TECH_INDICATORS,
+    )
 
     if not indicators:
         return "- **Technical:** No data\n"
 
     if brief:
-        signals = [f"{k}: {v['signal']}" for k, v in indicators.items() if v.get("signal")]
-        bullish = sum(1 for v in indicators.values() if "bullish" in (v.get("signal") or ""))
-        bearish = sum(1 for v in indicators.values() if "bearish" in (v.get("signal") or ""))
+        bullish = bearish = 0
+        signals = []
+        for k, v in indicators.items():
+            sig = v.get("signal")
+            if not sig:
+                continue
+            signals.append(f"{k}: {sig}")
+            direction = _SIGNAL_DIRECTION.get(sig, 0)
+            if direction > 0:
+                bullish += 1
+            elif direction < 0:
+                bearish += 1
         return f"- **Technical:** {bullish} bullish, {bearish} bearish ({', '.join(signals[:3])})\n"
 
-    lines = ["## Technical Indicators\n"]
+    buf = io.StringIO()
+    buf.write("## Technical Indicators\n\n")
     for name, data in indicators.items():
         val = data.get("value", "N/A")
         sig = data.get("signal", "neutral")
         if isinstance(val, (int, float)):
             val = f"{val:,.2f}" if abs(val) > 1 else f"{val:.6f}"
-        lines.append(f"- **{name}:** {val} — Signal: {sig}")
+        buf.write(f"- **{name}:** {val} — Signal: {sig}\n")
 
     # RSI history 7d/30d
     if not brief:
+        rsi_hist = (
+            db.table("technical_indicators")
+            .select("value")
+            .eq("indicator", "RSI_14")
+            .order("date", desc=True)
+            .limit(31)
+            .execute()
+        ).data or []
         for period, days in [("7d", 7), ("30d", 30)]:
-            rsi_hist = (
-                db.table("technical_indicators")
-                .select("value")
-                .eq("indicator", "RSI_14")
-                .order("date", desc=True)
-                .limit(days + 1)
-                .execute()
-            )
-            if rsi_hist.data and len(rsi_hist.data) > days:
-                prev_rsi = float(rsi_hist.data[days]["value"])
-                curr_rsi = float(rsi_hist.data[0]["value"])
-                lines.append(f"- RSI {period} ago: {prev_rsi:.1f} (now: {curr_rsi:.1f})")
+            if len(rsi_hist) > days:
+                prev_rsi = float(rsi_hist[days]["value"])
+                curr_rsi = float(rsi_hist[0]["value"])
+                buf.write(f"- RSI {period} ago: {prev_rsi:.1f} (now: {curr_rsi:.1f})\n")
 
-    lines.append("")
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
-def format_onchain_section(db, brief: bool = True) -> str:
+@ttl_cache(_SECTION_TTL)
+def format_onchain_section(db, brief: bool = True,
+                           snapshot: ContextSnapshot | None = None) -> str:
     """On-chain metrics."""
-    metrics = {}
-    for metric in ["HASH_RATE_MOM_30D", "NVT_RATIO"]:
-        res = (
-            db.table("onchain_metrics")
-            .select("metric,value,signal")
-            .eq("metric", metric)
-            .order("date", desc=True)
-            .limit(1)
-            .execute()
-        )
-        if res.data:
-            metrics[metric] = res.data[0]
+    metrics = _latest_rows(
+        db, snapshot.onchain if snapshot else None,
+        "onchain_metrics", "metric", "metric,value,signal", ONCHAIN_METRICS,
+    )
 
     if not metrics:
         return "- **On-Chain:** No data\n"
@@ -143,31 +253,29 @@ def format_onchain_section(db, brief: bool = True) -> str:
         signals = [f"{k}: {v['signal']}" for k, v in metrics.items() if v.get("signal")]
         return f"- **On-Chain:** {', '.join(signals)}\n"
 
-    lines = ["## On-Chain Metrics\n"]
+    buf = io.StringIO()
+    buf.write("## On-Chain Metrics\n\n")
     for name, data in metrics.items():
         val = data.get("value", "N/A")
         sig = data.get("signal", "neutral")
         if isinstance(val, (int, float)):
             val = f"{val:.4f}"
-        lines.append(f"- **{name}:** {val} — Signal: {sig}")
-    lines.append("")
-    return "\n".join(lines)
+        buf.write(f"- **{name}:** {val} — Signal: {sig}\n")
+    return buf.getvalue()
 
 
-def format_macro_section(db, brief: bool = True) -> str:
+@ttl_cache(_SECTION_TTL)
+def format_macro_section(db, brief: bool = True,
+                         snapshot: ContextSnapshot | None = None) -> str:
     """Macro correlations."""
-    corrs = {}
-    for pair in ["CORR_BTC_SPX_30D", "CORR_BTC_GOLD_30D", "CORR_BTC_DXY_30D"]:
-        res = (
-            db.table("technical_indicators")
-            .select("indicator,value")
-            .eq("indicator", pair)
-            .order("date", desc=True)
-            .limit(1)
-            .execute()
-        )
-        if res.data:
-            corrs[pair] = float(res.data[0]["value"])
+    prefetched = snapshot.tech if snapshot else None
+    corrs = {
+        pair: float(row["value"])
+        for pair, row in _latest_rows(
+            db, prefetched, "technical_indicators", "indicator", "indicator,value",
+            MACRO_PAIRS_30D,
+        ).items()
+    }
 
     if not corrs:
         return "- **Macro:** No correlation data\n"
@@ -179,102 +287,98 @@ def format_macro_section(db, brief: bool = True) -> str:
             parts.append(f"{short}: {val:+.2f}")
         return f"- **Macro (corr 30d):** {', '.join(parts)}\n"
 
-    lines = ["## Macro Correlations\n"]
+    buf = io.StringIO()
+    buf.write("## Macro Correlations\n\n")
     for name, val in corrs.items():
         label = name.replace("CORR_BTC_", "").replace("_", " ")
-        strength = "strong" if abs(val) > 0.6 else "moderate" if abs(val) > 0.3 else "weak"
+        strength = _CORR_STRENGTH[bisect_left(_CORR_THRESHOLDS, abs(val))]
         direction = "positive" if val > 0 else "negative"
-        lines.append(f"- **{label}:** {val:+.4f} ({direction} {strength})")
+        buf.write(f"- **{label}:** {val:+.4f} ({direction} {strength})\n")
 
     # Also fetch 90d correlations
-    for pair in ["CORR_BTC_SPX_90D", "CORR_BTC_GOLD_90D", "CORR_BTC_DXY_90D"]:
-        res = (
-            db.table("technical_indicators")
-            .select("indicator,value")
-            .eq("indicator", pair)
-            .order("date", desc=True)
-            .limit(1)
-            .execute()
-        )
-        if res.data:
-            val = float(res.data[0]["value"])
-            label = pair.replace("CORR_BTC_", "").replace("_", " ")
-            lines.append(f"- **{label}:** {val:+.4f}")
+    for pair, row in _latest_rows(
+        db, prefetched, "technical_indicators", "indicator", "indicator,value", MACRO_PAIRS_90D,
+    ).items():
+        val = float(row["value"])
+        label = pair.replace("CORR_BTC_", "").replace("_", " ")
+        buf.write(f"- **{label}:** {val:+.4f}\n")
 
-    lines.append("")
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
-def format_sentiment_section(db, brief: bool = True) -> str:
+@ttl_cache(_SECTION_TTL)
+def format_sentiment_section(db, brief: bool = True,
+                             snapshot: ContextSnapshot | None = None) -> str:
     """Sentiment."""
-    fg = (
-        db.table("sentiment_data")
-        .select("metric,value")
-        .eq("metric", "FEAR_GREED")
-        .order("date", desc=True)
-        .limit(1)
-        .execute()
-    )
-    fg30 = (
-        db.table("sentiment_data")
-        .select("metric,value")
-        .eq("metric", "FEAR_GREED_30D")
-        .order("date", desc=True)
-        .limit(1)
-        .execute()
-    )
-
-    fg_val = int(float(fg.data[0]["value"])) if fg.data else None
-    fg30_val = round(float(fg30.data[0]["value"]), 1) if fg30.data else None
+    history = None
+    if snapshot is not None:
+        latest = snapshot.sentiment
+    else:
+        # Current values and the 7d Fear & Greed history in one round-trip
+        res = (
+            db.table("sentiment_data")
+            .select("metric,value,date")
+            .in_("metric", SENTIMENT_METRICS)
+            .order("date", desc=True)
+            .limit(8 * len(SENTIMENT_METRICS))
+            .execute()
+        )
+        by_metric: dict[str, list[dict]] = {}
+        for row in res.data or []:
+            by_metric.setdefault(row["metric"], []).append(row)
+        latest = {m: rows[0] for m, rows in by_metric.items()}
+        missing = [m for m in SENTIMENT_METRICS if m not in latest]
+        if missing:
+            # A stale series fell outside the window
+            latest.update(_latest_rows(db, None, "sentiment_data", "metric", "metric,value", missing))
+        history = by_metric.get("FEAR_GREED", [])
+
+    fg = latest.get("FEAR_GREED")
+    fg30 = latest.get("FEAR_GREED_30D")
+
+    fg_val = int(float(fg["value"])) if fg else None
+    fg30_val = round(float(fg30["value"]), 1) if fg30 else None
 
     if fg_val is None:
         return "- **Sentiment:** No data\n"
 
-    # Classify
-    if fg_val <= 20:
-        label = "Extreme Fear"
-    elif fg_val <= 40:
-        label = "Fear"
-    elif fg_val <= 60:
-        label = "Neutral"
-    elif fg_val <= 80:
-        label = "Greed"
-    else:
-        label = "Extreme Greed"
+    label = _FG_LABELS[max(0, min(100, fg_val))]
 
     if brief:
         ma_str = f" (MA30d: {fg30_val})" if fg30_val else ""
         return f"- **Sentiment:** Fear & Greed: {fg_val} ({label}){ma_str}\n"
 
-    lines = ["## Sentiment\n"]
-    lines.append(f"- **Fear & Greed Index:** {fg_val} — {label}")
+    buf = io.StringIO()
+    buf.write("## Sentiment\n\n")
+    buf.write(f"- **Fear & Greed Index:** {fg_val} — {label}\n")
     if fg30_val:
-        lines.append(f"- **Fear & Greed 30d MA:** {fg30_val}")
+        buf.write(f"- **Fear & Greed 30d MA:** {fg30_val}\n")
 
     # Trend
-    fg_hist = (
-        db.table("sentiment_data")
-        .select("value")
-        .eq("metric", "FEAR_GREED")
-        .order("date", desc=True)
-        .limit(8)
-        .execute()
-    )
-    if fg_hist.data and len(fg_hist.data) >= 7:
-        week_ago = int(float(fg_hist.data[6]["value"]))
+    if history is None:
+        history = (
+            db.table("sentiment_data")
+            .select("value")
+            .eq("metric", "FEAR_GREED")
+            .order("date", desc=True)
+            .limit(8)
+            .execute()
+        ).data or []
+    if len(history) >= 7:
+        week_ago = int(float(history[6]["value"]))
         diff = fg_val - week_ago
-        lines.append(f"- **7d Change:** {diff:+d} (from {week_ago} to {fg_val})")
+        buf.write(f"- **7d Change:** {diff:+d} (from {week_ago} to {fg_val})\n")
 
-    lines.append("")
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
-def format_confluences_section(db) -> str:
+@ttl_cache(_SECTION_TTL)
+def format_confluences_section(db, as_of: date | None = None) -> str:
     """Detected confluences."""
     from btc_intel.analysis.confluence_detector import detect_confluences
 
     try:
-        result = detect_confluences()
+        result = _cached_analysis("confluences", detect_confluences, as_of)
     except Exception:
         return ""
 
@@ -287,123 +391,139 @@ def format_confluences_section(db) -> str:
             f"- No strong confluences detected\n"
         )
 
-    lines = ["## Confluences\n"]
+    buf = io.StringIO()
+    buf.write("## Confluences\n\n")
     for c in result["confluences"]:
-        lines.append(f"- **{c['type'].upper()}:** {c['message']}")
-    lines.append("")
-    return "\n".join(lines)
+        label = _CONFLUENCE_LABELS.get(c["type"]) or c["type"].upper()
+        buf.write(f"- **{label}:** {c['message']}\n")
+    return buf.getvalue()
 
 
-def format_alerts_section(db, detailed: bool = False) -> str:
+def format_alerts_section(db, detailed: bool = False,
+                          snapshot: ContextSnapshot | None = None) -> str:
     """Active alerts."""
-    alerts = (
-        db.table("alerts")
-        .select("*")
-        .eq("acknowledged", False)
-        .order("date", desc=True)
-        .limit(10)
-        .execute()
-    )
-    if not alerts.data:
+    if snapshot is not None:
+        alerts = snapshot.alerts
+    else:
+        alerts = (
+            db.table("alerts")
+            .select(ALERT_COLUMNS)
+            .eq("acknowledged", False)
+            .order("date", desc=True)
+            .limit(10)
+            .execute()
+        ).data
+    if not alerts:
         return "## Alerts\n- No active alerts\n"
 
-    lines = [f"## Alerts ({len(alerts.data)} active)\n"]
-    for alert in alerts.data:
-        sev = alert["severity"].upper()
+    buf = io.StringIO()
+    buf.write(f"## Alerts ({len(alerts)} active)\n\n")
+    for alert in alerts:
+        sev = _SEVERITY_LABELS.get(alert["severity"]) or alert["severity"].upper()
         if detailed:
-            lines.append(f"- [{sev}] **{alert['title']}**")
-            lines.append(f"  {alert.get('description', '')}")
-            lines.append(f"  Type: {alert['type']} | Signal: {alert.get('signal', 'N/A')}")
+            buf.write(
+                f"- [{sev}] **{alert['title']}**\n"
+                f"  {alert.get('description', '')}\n"
+                f"  Type: {alert['type']} | Signal: {alert.get('signal', 'N/A')}\n"
+            )
         else:
-            lines.append(f"- [{sev}] {alert['title']}")
-    lines.append("")
-    return "\n".join(lines)
+            buf.write(f"- [{sev}] {alert['title']}\n")
+    return buf.getvalue()
 
 
 def format_conclusions_section(db, limit: int = 3, category: str | None = None) -> str:
     """Recent conclusions."""
-    query = (
-        db.table("conclusions")
-        .select("title,content,category,confidence,created_at")
-        .eq("status", "active")
-        .order("created_at", desc=True)
-    )
-    if category:
-        query = query.eq("category", category)
+    def fetch(table: str):
+        query = (
+            db.table(table)
+            .select("title,content,category,confidence,created_at")
+            .eq("status", "active")
+            .order("created_at", desc=True)
+        )
+        if category:
+            query = query.eq("category", category)
+        return query.limit(limit).execute()
 
-    result = query.limit(limit).execute()
+    # The preview view (migration 009) trims content server-side; fall back to
+    # the base table on databases where it has not been applied yet.
+    try:
+        result = fetch("conclusions_preview")
+    except APIError as e:
+        if e.code not in MISSING_RELATION:
+            raise
+        result = fetch("conclusions")
 
     if not result.data:
         label = f" ({category})" if category else ""
         return f"## Recent Conclusions{label}\n- No conclusions recorded\n"
 
-    lines = [f"## Recent Conclusions ({len(result.data)})\n"]
+    buf = io.StringIO()
+    buf.write(f"## Recent Conclusions ({len(result.data)})\n\n")
     for c in result.data:
         conf = c.get("confidence", "?")
         cat = c.get("category", "general")
-        lines.append(f"- [{cat}] **{c['title']}** (confidence: {conf}/10)")
+        buf.write(f"- [{cat}] **{c['title']}** (confidence: {conf}/10)\n")
         if c.get("content"):
-            lines.append(f"  {c['content'][:150]}...")
-    lines.append("")
-    return "\n".join(lines)
+            buf.write(f"  {c['content'][:150]}...\n")
+    return buf.getvalue()
 
 
-def format_risk_section(db) -> str:
+def format_risk_section(db, as_of: date | None = None) -> str:
     """Risk metrics."""
     from btc_intel.analysis.risk import analyze_risk
 
     try:
-        risk = analyze_risk()
+        risk = _cached_analysis("risk", analyze_risk, as_of)
     except Exception:
         return ""
 
     if not risk:
         return ""
 
-    lines = ["## Risk\n"]
-    lines.append(f"- Current drawdown: {risk.get('current_drawdown', 'N/A')}%")
-    lines.append(f"- 30d volatility: {risk.get('volatility_30d', 'N/A')}%")
-    lines.append(f"- Sharpe (365d): {risk.get('sharpe_365d', 'N/A')}")
-    lines.append(f"- VaR 95%: {risk.get('var_95', 'N/A')}%")
+    buf = io.StringIO()
+    buf.write("## Risk\n\n")
+    buf.write(f"- Current drawdown: {risk.get('current_drawdown', 'N/A')}%\n")
+    buf.write(f"- 30d volatility: {risk.get('volatility_30d', 'N/A')}%\n")
+    buf.write(f"- Sharpe (365d): {risk.get('sharpe_365d', 'N/A')}\n")
+    buf.write(f"- VaR 95%: {risk.get('var_95', 'N/A')}%\n")
     if risk.get("beta_vs_spx"):
-        lines.append(f"- Beta vs SPX: {risk['beta_vs_spx']}")
-    lines.append("")
-    return "\n".join(lines)
+        buf.write(f"- Beta vs SPX: {risk['beta_vs_spx']}\n")
+    return buf.getvalue()
 
 
-def format_cycles_section(db) -> str:
+def format_cycles_section(db, as_of: date | None = None) -> str:
     """Detailed cycle analysis."""
     from btc_intel.analysis.cycles import analyze_cycles
 
     try:
-        cycles = analyze_cycles()
+        cycles = _cached_analysis("cycles", analyze_cycles, as_of)
     except Exception:
         return ""
 
     if not cycles:
         return ""
 
-    lines = ["## Cycle Analysis\n"]
-    lines.append(f"- Cycle: #{cycles.get('cycle_number', '?')}")
-    lines.append(f"- Last halving: {cycles.get('last_halving', 'N/A')}")
-    lines.append(f"- Days since halving: {cycles.get('days_since_halving', 'N/A')}")
-    lines.append(f"- Price at halving: ${cycles.get('halving_price', 0):,.2f}")
-    lines.append(f"- Current price: ${cycles.get('current_price', 0):,.2f}")
-    lines.append(f"- ROI since halving: {cycles.get('roi_since_halving', 0):+.2f}%")
+    buf = io.StringIO()
+    buf.write("## Cycle Analysis\n\n")
+    buf.write(f"- Cycle: #{cycles.get('cycle_number', '?')}\n")
+    buf.write(f"- Last halving: {cycles.get('last_halving', 'N/A')}\n")
+    buf.write(f"- Days since halving: {cycles.get('days_since_halving', 'N/A')}\n")
+    buf.write(f"- Price at halving: ${cycles.get('halving_price', 0):,.2f}\n")
+    buf.write(f"- Current price: ${cycles.get('current_price', 0):,.2f}\n")
+    buf.write(f"- ROI since halving: {cycles.get('roi_since_halving', 0):+.2f}%\n")
 
     if cycles.get("comparisons"):
-        lines.append("\n### Comparison with previous cycles")
+        buf.write("\n### Comparison with previous cycles\n")
         for name, comp in cycles["comparisons"].items():
-            lines.append(f"- {name} - day {comp['days']}: ROI {comp['roi']:+.2f}%")
+            buf.write(f"- {name} - day {comp['days']}: ROI {comp['roi']:+.2f}%\n")
 
-    lines.append("")
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
-def format_events_section(db) -> str:
+@ttl_cache(_SECTION_TTL)
+def format_events_section(db, as_of: date | None = None) -> str:
     """Upcoming or recent events."""
-    today = str(date.today())
-    week_ahead = str(date.today() + timedelta(days=7))
+    today, _, week_ahead = _today_strs(as_of)
 
     events = (
         db.table("events")
@@ -418,115 +538,115 @@ def format_events_section(db) -> str:
     if not events.data:
         return ""
 
-    lines = ["## Upcoming Events\n"]
+    buf = io.StringIO()
+    buf.write("## Upcoming Events\n\n")
     for e in events.data:
         impact = e.get("impact", "N/A")
-        lines.append(f"- [{e['date']}] **{e['title']}** (type: {e.get('category', 'N/A')}, impact: {impact})")
-    lines.append("")
-    return "\n".join(lines)
+        buf.write(f"- [{e['date']}] **{e['title']}** (type: {e.get('category', 'N/A')}, impact: {impact})\n")
+    return buf.getvalue()
 
 
-def format_signal_changes(db) -> str:
+def format_signal_changes(db, as_of: date | None = None) -> str:
     """Signals that changed since yesterday."""
-    yesterday = str(date.today() - timedelta(days=1))
-    today = str(date.today())
+    today, yesterday, _ = _today_strs(as_of)
+
+    rows = call_rpc(db, "signal_change_snapshot", {"day": today, "indicators": CHANGE_INDICATORS})
+    if rows is None:
+        # One latest-per-indicator lookup per cutoff day, both in flight at once
+        now, prev = gather([
+            partial(latest_by_key, db, "technical_indicators", "indicator", "signal",
+                    CHANGE_INDICATORS, day)
+            for day in (today, yesterday)
+        ])
+        rows = [
+            {
+                "indicator": ind,
+                "today_sig": (now.get(ind) or {}).get("signal"),
+                "yest_sig": (prev.get(ind) or {}).get("signal"),
+            }
+            for ind in CHANGE_INDICATORS
+        ]
 
     changes = []
-
-    # Check technical indicators
-    for ind in ["RSI_14", "MACD", "SMA_CROSS"]:
-        today_sig = (
-            db.table("technical_indicators")
-            .select("signal")
-            .eq("indicator", ind)
-            .lte("date", today)
-            .order("date", desc=True)
-            .limit(1)
-            .execute()
-        )
-        yest_sig = (
-            db.table("technical_indicators")
-            .select("signal")
-            .eq("indicator", ind)
-            .lte("date", yesterday)
-            .order("date", desc=True)
-            .limit(1)
-            .execute()
-        )
-
-        if today_sig.data and yest_sig.data:
-            t = today_sig.data[0]["signal"]
-            y = yest_sig.data[0]["signal"]
-            if t != y:
-                changes.append(f"- **{ind}:** {y} -> {t}")
+    for row in rows:
+        t, y = row.get("today_sig"), row.get("yest_sig")
+        if t and y and t != y:
+            changes.append(f"- **{row['indicator']}:** {y} -> {t}")
 
     if not changes:
         return "## Changes Since Yesterday\n- No significant signal changes\n"
 
-    lines = ["## Changes Since Yesterday\n"] + changes + [""]
-    return "\n".join(lines)
+    buf = io.StringIO()
+    buf.write("## Changes Since Yesterday\n\n")
+    for change in changes:
+        buf.write(change + "\n")
+    return buf.getvalue()
 
 
+@ttl_cache(_SECTION_TTL)
 def format_compare_section(db, date1: str, date2: str) -> str:
     """Compare two dates side-by-side."""
-    lines = [f"## Comparison: {date1} vs {date2}\n"]
+    snap = call_rpc(db, "compare_snapshot", {"d1": date1, "d2": date2})
+    if isinstance(snap, dict):
+        points = [(date1, snap.get("d1") or {}), (date2, snap.get("d2") or {})]
+    else:
+        points = _compare_points(db, date1, date2)
+
+    buf = io.StringIO()
+    buf.write(f"## Comparison: {date1} vs {date2}\n\n")
 
     # Prices
-    for d in [date1, date2]:
-        price = (
-            db.table("btc_prices")
-            .select("close")
-            .lte("date", d)
-            .order("date", desc=True)
-            .limit(1)
-            .execute()
-        )
-        if price.data:
-            lines.append(f"- Price ({d}): ${float(price.data[0]['close']):,.2f}")
+    for d, p in points:
+        if p.get("price"):
+            buf.write(f"- Price ({d}): ${float(p['price']['close']):,.2f}\n")
 
     # RSI
-    lines.append("\n### RSI")
-    for d in [date1, date2]:
-        rsi = (
-            db.table("technical_indicators")
-            .select("value,signal")
-            .eq("indicator", "RSI_14")
-            .lte("date", d)
-            .order("date", desc=True)
-            .limit(1)
-            .execute()
-        )
-        if rsi.data:
-            lines.append(f"- RSI ({d}): {float(rsi.data[0]['value']):.1f} — {rsi.data[0]['signal']}")
+    buf.write("\n### RSI\n")
+    for d, p in points:
+        if p.get("rsi"):
+            buf.write(f"- RSI ({d}): {float(p['rsi']['value']):.1f} — {p['rsi']['signal']}\n")
 
     # Cycle Score
-    lines.append("\n### Cycle Score")
-    for d in [date1, date2]:
-        cs = (
-            db.table("cycle_score_history")
-            .select("score,phase")
-            .lte("date", d)
-            .order("date", desc=True)
-            .limit(1)
-            .execute()
-        )
-        if cs.data:
-            lines.append(f"- Score ({d}): {cs.data[0]['score']}/100 — {cs.data[0]['phase']}")
+    buf.write("\n### Cycle Score\n")
+    for d, p in points:
+        if p.get("cycle"):
+            buf.write(f"- Score ({d}): {p['cycle']['score']}/100 — {p['cycle']['phase']}\n")
 
     # Fear & Greed
-    lines.append("\n### Sentiment")
-    for d in [date1, date2]:
-        fg = (
-            db.table("sentiment_data")
-            .select("value")
-            .eq("metric", "FEAR_GREED")
-            .lte("date", d)
-            .order("date", desc=True)
-            .limit(1)
-            .execute()
-        )
-        if fg.data:
-            lines.append(f"- Fear & Greed ({d}): {int(float(fg.data[0]['value']))}")
-
-    lines.append("")
-    return "\n".join(lines)
+    buf.write("\n### Sentiment\n")
+    for d, p in points:
+        if p.get("sentiment"):
+            buf.write(f"- Fear & Greed ({d}): {int(float(p['sentiment']['value']))}\n")
+
+    return buf.getvalue()
+
+
+def _compare_points(db, date1: str, date2: str) -> list[tuple[str, dict]]:
+    """Latest price, RSI, cycle score and Fear & Greed on or before each date.
+
+    Table-query fallback for the compare_snapshot RPC (migration 010); the
+    eight lookups run concurrently.
+    """
+    sources = {
+        "price": lambda: db.table("btc_prices").select("close"),
+        "rsi": lambda: (
+            db.table("technical_indicators").select("value,signal").eq("indicator", "RSI_14")
+        ),
+        "cycle": lambda: db.table("cycle_score_history").select("score,phase"),
+        "sentiment": lambda: (
+            db.table("sentiment_data").select("value").eq("metric", "FEAR_GREED")
+        ),
+    }
+    dates = (date1, date2)
+    results = iter(gather([
+        source().lte("date", d).order("date", desc=True).limit(1).execute
+        for d in dates for source in sources.values()
+    ]))
+    points = []
+    for d in dates:
+        point = {}
+        for name in sources:
+            res = next(results)
+            point[name] = res.data[0] if res.data else None
+        points.append((d, point))
+    return points
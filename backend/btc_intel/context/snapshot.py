@@ -0,0 +1,174 @@
+"""Context Snapshot — Latest rows for every brief section, fetched once per render."""
+
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from btc_intel.context.cache import ttl_cache
+from btc_intel.db import call_rpc
+
+TECH_INDICATORS = ["RSI_14", "MACD", "SMA_CROSS", "BB_UPPER", "BB_LOWER", "ATR_14"]
+MACRO_PAIRS_30D = ["CORR_BTC_SPX_30D", "CORR_BTC_GOLD_30D", "CORR_BTC_DXY_30D"]
+MACRO_PAIRS_90D = ["CORR_BTC_SPX_90D", "CORR_BTC_GOLD_90D", "CORR_BTC_DXY_90D"]
+ONCHAIN_METRICS = ["HASH_RATE_MOM_30D", "NVT_RATIO"]
+SENTIMENT_METRICS = ["FEAR_GREED", "FEAR_GREED_30D"]
+CHANGE_INDICATORS = ["RSI_14", "MACD", "SMA_CROSS"]
+# Keep in sync with the alerts projection in get_briefing_snapshot (migration 013)
+ALERT_COLUMNS = "date,type,severity,title,description,signal"
+
+# Days of history scanned per key when resolving "latest row per key" in one query
+_LOOKBACK_DAYS = 7
+
+# Two pools so waiting never deadlocks: section jobs (_EXECUTOR) may block on
+# query jobs, while query jobs (_QUERY_EXECUTOR) only ever run a single request.
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="context")
+_QUERY_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="context-query")
+
+
+@dataclass
+class ContextSnapshot:
+    """Pre-fetched data shared by the brief formatters of a single render."""
+    prices: list[dict] = field(default_factory=list)  # newest first, up to 31 rows
+    cycle: list[dict] = field(default_factory=list)  # newest first, up to 2 rows
+    tech: dict[str, dict] = field(default_factory=dict)  # indicator -> latest row
+    onchain: dict[str, dict] = field(default_factory=dict)  # metric -> latest row
+    sentiment: dict[str, dict] = field(default_factory=dict)  # metric -> latest row
+    alerts: list[dict] = field(default_factory=list)  # unacknowledged, newest first
+
+
+@ttl_cache(300)
+def load_snapshot(db) -> ContextSnapshot:
+    """Fetch every slice the brief formatters need.
+
+    One get_briefing_snapshot RPC call when deployed (migration 013),
+    otherwise one query per table, in parallel.
+    """
+    doc = call_rpc(db, "get_briefing_snapshot", {
+        "tech_keys": TECH_INDICATORS + MACRO_PAIRS_30D + MACRO_PAIRS_90D,
+        "onchain_keys": ONCHAIN_METRICS,
+        "sentiment_keys": SENTIMENT_METRICS,
+    })
+    if isinstance(doc, dict):
+        return ContextSnapshot(
+            prices=doc.get("prices") or [],
+            cycle=doc.get("cycle") or [],
+            tech=doc.get("tech") or {},
+            onchain=doc.get("onchain") or {},
+            sentiment=doc.get("sentiment") or {},
+            alerts=doc.get("alerts") or [],
+        )
+
+    prices = _QUERY_EXECUTOR.submit(
+        db.table("btc_prices")
+        .select("date,close")
+        .order("date", desc=True)
+        .limit(31)
+        .execute
+    )
+    cycle = _QUERY_EXECUTOR.submit(
+        db.table("cycle_score_history")
+        .select("date,score,phase")
+        .order("date", desc=True)
+        .limit(2)
+        .execute
+    )
+    alerts = _QUERY_EXECUTOR.submit(
+        db.table("alerts")
+        .select(ALERT_COLUMNS)
+        .eq("acknowledged", False)
+        .order("date", desc=True)
+        .limit(10)
+        .execute
+    )
+    tech = _QUERY_EXECUTOR.submit(
+        latest_by_key, db, "technical_indicators", "indicator", "value,signal",
+        TECH_INDICATORS + MACRO_PAIRS_30D + MACRO_PAIRS_90D,
+    )
+    onchain = _QUERY_EXECUTOR.submit(
+        latest_by_key, db, "onchain_metrics", "metric", "value,signal", ONCHAIN_METRICS,
+    )
+    sentiment = _QUERY_EXECUTOR.submit(
+        latest_by_key, db, "sentiment_data", "metric", "value", SENTIMENT_METRICS,
+    )
+
+    return ContextSnapshot(
+        prices=prices.result().data or [],
+        cycle=cycle.result().data or [],
+        tech=tech.result(),
+        onchain=onchain.result(),
+        sentiment=sentiment.result(),
+        alerts=alerts.result().data or [],
+    )
+
+
+def submit(fn, *args, **kwargs) -> Future:
+    """Run a section formatter on the shared section pool.
+
+    Section jobs may wait on gather() / load_snapshot(), which use the query
+    pool, but must not wait on other section jobs.
+    """
+    return _EXECUTOR.submit(fn, *args, **kwargs)
+
+
+def gather(calls: list[Callable]) -> list:
+    """Run independent zero-argument query callables concurrently; results in order.
+
+    Callables must not submit further work themselves — they run on the query
+    pool, which is reserved for leaf requests.
+    """
+    if len(calls) <= 1:
+        return [call() for call in calls]
+    futures = [_QUERY_EXECUTOR.submit(call) for call in calls]
+    return [f.result() for f in futures]
+
+
+def latest_indicators(db, names: list[str], as_of: str | None = None) -> dict[str, dict] | None:
+    """Latest technical_indicators row per name (on or before ``as_of``) via RPC.
+
+    Returns None when the RPC (migration 012) is not deployed.
+    """
+    rows = call_rpc(db, "latest_indicators", {"names": names, "as_of": as_of})
+    if rows is None:
+        return None
+    return {row["indicator"]: row for row in rows}
+
+
+def latest_by_key(db, table: str, key_col: str, cols: str, keys: list[str],
+                  as_of: str | None = None) -> dict[str, dict]:
+    """Latest row per key (on or before ``as_of``) with a single query.
+
+    Technical indicators use the latest_indicators RPC when available.
+    Otherwise one IN query scans the most recent rows for all keys at once;
+    any key not present in that window (stale series) falls back to its own
+    limit-1 query.
+    """
+    if table == "technical_indicators":
+        latest = latest_indicators(db, keys, as_of)
+        if latest is not None:
+            return latest
+
+    def recent(query):
+        return query.lte("date", as_of) if as_of else query
+
+    res = recent(
+        db.table(table)
+        .select(f"{key_col},{cols},date")
+        .in_(key_col, keys)
+    ).order("date", desc=True).limit(len(keys) * _LOOKBACK_DAYS).execute()
+    latest: dict[str, dict] = {}
+    for row in res.data or []:
+        latest.setdefault(row[key_col], row)
+
+    # Runs on the query pool already, so stale keys are fetched one by one
+    for key in keys:
+        if key in latest:
+            continue
+        one = recent(
+            db.table(table)
+            .select(f"{key_col},{cols},date")
+            .eq(key_col, key)
+        ).order("date", desc=True).limit(1).execute()
+        if one.data:
+            latest[key] = one.data[0]
+
+    return latest
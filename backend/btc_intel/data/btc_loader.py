@@ -1,15 +1,29 @@
 """BTC Price Loader — Download historical Bitcoin prices via yfinance."""
 
-from datetime import date, datetime, timedelta, timezone
+import asyncio
+from datetime import UTC, date, datetime, timedelta
+from functools import cache
 
 import pandas as pd
 import yfinance as yf
 from rich.console import Console
 
+from btc_intel.data.upsert import bulk_upsert, upsert_batches
 from btc_intel.db import get_supabase
 
 console = Console()
 
+# Above this many rows (backfills) the daily loader prefers COPY over PostgREST.
+# Lower than upsert.BULK_THRESHOLD: the full daily history since 2014 (~4,000
+# rows) would never reach the shared cut-over
+BTC_BULK_MIN_ROWS = 200
+
+
+@cache
+def _btc_ticker() -> yf.Ticker:
+    """Process-wide BTC-USD ticker, so yfinance's session setup happens once."""
+    return yf.Ticker("BTC-USD")
+
 
 async def load_btc_prices(since: date | None = None) -> int:
     """Descarga precios BTC OHLCV desde yfinance y los sube a Supabase.
@@ -19,10 +33,15 @@ async def load_btc_prices(since: date | None = None) -> int:
     """
     db = get_supabase()
 
+    stored: dict[str, float] = {}
     if since is None:
-        result = db.table("btc_prices").select("date").order("date", desc=True).limit(1).execute()
+        # yfinance and the sync Supabase client block: run them on worker threads
+        result = await asyncio.to_thread(
+            db.table("btc_prices").select("date,close").order("date", desc=True).limit(1).execute
+        )
         if result.data:
             last_date = date.fromisoformat(result.data[0]["date"])
+            stored[result.data[0]["date"]] = float(result.data[0]["close"])
             # Always re-fetch today to get the latest intraday price
             since = min(last_date, date.today())
         else:
@@ -32,35 +51,28 @@ async def load_btc_prices(since: date | None = None) -> int:
 
     console.print(f"[cyan]Descargando BTC OHLCV ({since} → {today})...[/cyan]")
 
-    ticker = yf.Ticker("BTC-USD")
-    df = ticker.history(start=str(since), end=str(today + timedelta(days=1)))
+    ticker = _btc_ticker()
+    df = await asyncio.to_thread(
+        ticker.history, start=str(since), end=str(today + timedelta(days=1)),
+    )
 
     if df.empty:
         console.print("[yellow]No new BTC data[/yellow]")
         return 0
 
-    rows = []
-    for idx, row in df.iterrows():
-        rows.append({
-            "date": str(idx.date()),
-            "open": round(float(row["Open"]), 2),
-            "high": round(float(row["High"]), 2),
-            "low": round(float(row["Low"]), 2),
-            "close": round(float(row["Close"]), 2),
-            "volume": round(float(row["Volume"]), 8) if pd.notna(row["Volume"]) else None,
-            "source": "yahoo_finance",
-        })
-
-    # Upsert en batches
-    inserted = 0
-    batch_size = 500
-    for i in range(0, len(rows), batch_size):
-        batch = rows[i:i + batch_size]
-        try:
-            db.table("btc_prices").upsert(batch, on_conflict="date").execute()
-            inserted += len(batch)
-        except Exception as e:
-            console.print(f"[red]Error upserting batch: {e}[/red]")
+    # The re-fetched last day only needs a write if its close moved
+    rows = _drop_unchanged(_ohlcv_rows(df, "date", df.index.strftime("%Y-%m-%d")), "date", stored)
+    if not rows:
+        console.print("[yellow]No new BTC data[/yellow]")
+        return 0
+
+    # Backfills go through COPY when a direct connection is configured
+    inserted = (
+        await bulk_upsert("btc_prices", rows, "date") if len(rows) > BTC_BULK_MIN_ROWS else None
+    )
+    if inserted is None:
+        # Upsert en batches
+        inserted = await upsert_batches(db, "btc_prices", rows, on_conflict="date")
 
     console.print(f"[green]✅ BTC prices: {inserted} filas[/green]")
     return inserted
@@ -75,19 +87,21 @@ async def load_btc_hourly() -> int:
     """
     db = get_supabase()
 
-    # Detect last hourly timestamp in DB
-    result = (
+    # Detect last hourly timestamp in DB; the recent closes let us skip
+    # re-fetched candles that have not changed
+    result = await asyncio.to_thread(
         db.table("btc_prices_1h")
-        .select("timestamp")
+        .select("timestamp,close")
         .order("timestamp", desc=True)
-        .limit(1)
-        .execute()
+        .limit(48)
+        .execute
     )
+    stored = {
+        _parse_ts(r["timestamp"]).isoformat(): float(r["close"]) for r in result.data or []
+    }
 
     if result.data:
-        last_ts = datetime.fromisoformat(
-            result.data[0]["timestamp"].replace("Z", "+00:00")
-        )
+        last_ts = _parse_ts(result.data[0]["timestamp"])
         # Re-fetch from last_ts to capture any late candle updates
         start = last_ts - timedelta(hours=2)
         period = None
@@ -101,46 +115,59 @@ async def load_btc_hourly() -> int:
         f"({'full 60d' if period else f'since {start:%Y-%m-%d %H:%M}'})...[/cyan]"
     )
 
-    ticker = yf.Ticker("BTC-USD")
+    ticker = _btc_ticker()
     if period:
-        df = ticker.history(interval="1h", period=period)
+        df = await asyncio.to_thread(ticker.history, interval="1h", period=period)
     else:
-        df = ticker.history(
+        df = await asyncio.to_thread(
+            ticker.history,
             interval="1h",
             start=start.strftime("%Y-%m-%d"),
-            end=(datetime.now(timezone.utc) + timedelta(days=1)).strftime("%Y-%m-%d"),
+            end=(datetime.now(UTC) + timedelta(days=1)).strftime("%Y-%m-%d"),
         )
 
     if df.empty:
         console.print("[yellow]No new BTC hourly data[/yellow]")
         return 0
 
-    rows = []
-    for idx, row in df.iterrows():
-        # yfinance returns timezone-aware DatetimeIndex
-        ts = idx.to_pydatetime()
-        if ts.tzinfo is None:
-            ts = ts.replace(tzinfo=timezone.utc)
-        rows.append({
-            "timestamp": ts.isoformat(),
-            "open": round(float(row["Open"]), 2),
-            "high": round(float(row["High"]), 2),
-            "low": round(float(row["Low"]), 2),
-            "close": round(float(row["Close"]), 2),
-            "volume": round(float(row["Volume"]), 8) if pd.notna(row["Volume"]) else None,
-            "source": "yahoo_finance",
-        })
+    # yfinance returns timezone-aware DatetimeIndex; normalize to UTC so the
+    # strings line up with what PostgREST returns for stored rows
+    idx = df.index if df.index.tz is not None else df.index.tz_localize(UTC)
+    idx = idx.tz_convert(UTC)
+    # ISO 8601 offsets need a colon ("+00:00"), which %z omits
+    ts = pd.Series(idx.strftime("%Y-%m-%dT%H:%M:%S%z"), index=df.index)
+    rows = _drop_unchanged(
+        _ohlcv_rows(df, "timestamp", ts.str[:-2] + ":" + ts.str[-2:]), "timestamp", stored,
+    )
+    if not rows:
+        console.print("[yellow]No new BTC hourly data[/yellow]")
+        return 0
 
     # Upsert in batches
-    inserted = 0
-    batch_size = 500
-    for i in range(0, len(rows), batch_size):
-        batch = rows[i:i + batch_size]
-        try:
-            db.table("btc_prices_1h").upsert(batch, on_conflict="timestamp").execute()
-            inserted += len(batch)
-        except Exception as e:
-            console.print(f"[red]Error upserting hourly batch: {e}[/red]")
+    inserted = await upsert_batches(
+        db, "btc_prices_1h", rows, on_conflict="timestamp", label="hourly batch",
+    )
 
     console.print(f"[green]✅ BTC hourly prices: {inserted} filas[/green]")
     return inserted
+
+
+def _ohlcv_rows(df: pd.DataFrame, key: str, keys) -> list[dict]:
+    """Vectorized yfinance OHLCV frame -> upsert rows keyed by ``key``."""
+    out = df[["Open", "High", "Low", "Close", "Volume"]].round(
+        {"Open": 2, "High": 2, "Low": 2, "Close": 2, "Volume": 8}
+    ).rename(columns=str.lower)
+    out["volume"] = out["volume"].astype(object).where(out["volume"].notna(), None)
+    out.insert(0, key, list(keys))
+    out["source"] = "yahoo_finance"
+    return out.to_dict(orient="records")
+
+
+def _drop_unchanged(rows: list[dict], key: str, stored: dict[str, float]) -> list[dict]:
+    """Skip rows already stored with the same close (re-fetch overlap window)."""
+    return [r for r in rows if stored.get(r[key]) != r["close"]]
+
+
+def _parse_ts(value: str) -> datetime:
+    """Parse a PostgREST timestamptz string (``Z`` or ``+00:00`` offset)."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
@@ -1,12 +1,15 @@
 """Cycles Seed — Define Bitcoin's historical cycles."""
 
+from types import MappingProxyType
+
+from postgrest.exceptions import APIError
 from rich.console import Console
 
-from btc_intel.db import get_supabase
+from btc_intel.db import NO_CONFLICT_TARGET, get_supabase
 
 console = Console()
 
-CYCLES = [
+_CYCLES_RAW = [
     # Complete halving cycles
     # bottom = bear market low after the peak, NOT the halving date price
     {
@@ -147,28 +150,51 @@ CYCLES = [
     },
 ]
 
+# Read-only view shared by every importer; seeds copy rows to dicts to send them
+CYCLES = tuple(MappingProxyType(row) for row in _CYCLES_RAW)
+
 
 def seed_cycles() -> int:
     """Load historical cycles into Supabase."""
     db = get_supabase()
     console.print("[cyan]Loading historical cycles...[/cyan]")
 
-    inserted = 0
-    for cycle in CYCLES:
-        try:
-            existing = (
-                db.table("cycles")
-                .select("id")
-                .eq("name", cycle["name"])
-                .execute()
-            )
-            if existing.data:
-                continue
-
-            db.table("cycles").insert(cycle).execute()
-            inserted += 1
-        except Exception as e:
-            console.print(f"  [red]Error: {cycle['name']} — {e}[/red]")
+    # One request for the whole list; rows already present (migration 016
+    # unique key) are skipped and only new rows come back
+    try:
+        res = (
+            db.table("cycles")
+            .upsert([dict(row) for row in CYCLES], on_conflict="name",
+                    ignore_duplicates=True, default_to_null=False)
+            .execute()
+        )
+        inserted = len(res.data or [])
+    except APIError as e:
+        if e.code != NO_CONFLICT_TARGET:
+            raise
+        # Unique key not deployed: fetch existing keys once, insert the rest
+        inserted = _insert_missing(db)
 
     console.print(f"[green]Cycles: {inserted} new of {len(CYCLES)} total[/green]")
     return inserted
+
+
+def _insert_missing(db) -> int:
+    """Two-request fallback: one SELECT ... IN for existing keys, one bulk insert."""
+    try:
+        existing = (
+            db.table("cycles")
+            .select("name")
+            .in_("name", [c["name"] for c in CYCLES])
+            .execute()
+        )
+        have = {r["name"] for r in existing.data or []}
+        missing = [c for c in CYCLES if c["name"] not in have]
+        if missing:
+            db.table("cycles").insert(
+                [dict(row) for row in missing], default_to_null=False
+            ).execute()
+        return len(missing)
+    except Exception as e:
+        console.print(f"  [red]Error: {e}[/red]")
+        return 0
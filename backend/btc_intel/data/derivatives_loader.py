@@ -1,96 +1,141 @@
 """Derivatives Loader — Funding Rate & Open Interest from OKX (free, no auth, global access)."""
 
+import asyncio
 from datetime import date
 
-import httpx
 from rich.console import Console
 
+from btc_intel.analysis.derivatives import classify_funding_rate
+from btc_intel.data.http_client import TokenBucket, get_client, response_json
 from btc_intel.db import get_supabase
 
 console = Console()
 
-HEADERS = {"User-Agent": "btc-intel/1.0"}
 
+def _okx_funding(data: dict) -> float | None:
+    """Last settled (or current predicted) funding rate, in percent."""
+    items = data.get("data", [])
+    if not items:
+        return None
+    # settFundingRate = last settled rate, fundingRate = current predicted
+    settled = items[0].get("settFundingRate", "")
+    current = items[0].get("fundingRate", "")
+    rate_str = settled if settled else current
+    return float(rate_str) * 100 if rate_str else 0  # to percentage
+
+
+def _okx_oi(data: dict) -> tuple[float, float] | None:
+    """Open interest as (USD, BTC)."""
+    items = data.get("data", [])
+    if not items:
+        return None
+    return float(items[0].get("oiUsd", 0)), float(items[0].get("oiCcy", 0))
+
+
+# Per exchange: a rate limiter at its public quota, and the (url, params) of
+# each endpoint with the parser of its JSON body
+EXCHANGES = {
+    "okx": {
+        "limiter": TokenBucket(rate=10, capacity=20),  # 20 requests / 2 s per IP
+        "funding": (
+            "https://www.okx.com/api/v5/public/funding-rate",
+            {"instId": "BTC-USDT-SWAP"},
+            _okx_funding,
+        ),
+        "oi": (
+            "https://www.okx.com/api/v5/public/open-interest",
+            {"instType": "SWAP", "instId": "BTC-USDT-SWAP"},
+            _okx_oi,
+        ),
+    },
+}
+
+
+async def load_derivatives_data(source: str = "okx") -> int:
+    """Load funding rate and open interest from an exchange's public API."""
+    # _store writes through the sync Supabase client: keep it off the event loop
+    return await asyncio.to_thread(_store, *await _fetch_all(get_client(), source))
+
+
+async def load_derivatives_hedged(sources: tuple[str, ...] = tuple(EXCHANGES)) -> int:
+    """Query every exchange at once and store the first usable answer.
+
+    The other requests are cancelled. Rows keep the winning exchange as source.
+    """
+    client = get_client()
+    tasks = [asyncio.create_task(_fetch_all(client, s)) for s in sources]
+    try:
+        for done in asyncio.as_completed(tasks):
+            source, funding, oi = await done
+            if not (isinstance(funding, Exception) and isinstance(oi, Exception)):
+                return await asyncio.to_thread(_store, source, funding, oi)
+            console.print(f"  [yellow]{source}: {funding}[/yellow]")
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    console.print("  [yellow]Derivatives: no exchange answered[/yellow]")
+    return 0
+
+
+async def _fetch_all(client, source: str) -> tuple:
+    """(source, funding, oi) of one exchange; failed fetches come back as exceptions."""
+    exchange = EXCHANGES[source]
+    # Independent endpoints: fetch both at once, report failures separately
+    funding, oi = await asyncio.gather(
+        _fetch(client, exchange["limiter"], *exchange["funding"]),
+        _fetch(client, exchange["limiter"], *exchange["oi"]),
+        return_exceptions=True,
+    )
+    return source, funding, oi
+
+
+def _store(source: str, funding, oi) -> int:
+    """Upsert whichever of the two metrics was fetched. Returns rows written."""
+    today = date.today().isoformat()
+    records = []
+    if isinstance(funding, Exception):
+        console.print(f"  [yellow]Funding Rate error: {funding}[/yellow]")
+    elif funding is not None:
+        records.append({
+            "date": today,
+            "metric": "FUNDING_RATE",
+            "value": funding,
+            "signal": classify_funding_rate(funding),
+            "source": source,
+        })
+        console.print(f"  Funding Rate: {funding:.4f}%")
+
+    if isinstance(oi, Exception):
+        console.print(f"  [yellow]Open Interest error: {oi}[/yellow]")
+    elif oi is not None:
+        oi_usd, oi_btc = oi
+        records.append({
+            "date": today,
+            "metric": "OPEN_INTEREST",
+            "value": oi_usd,
+            "signal": None,  # Signal computed in analysis step
+            "source": source,
+        })
+        console.print(f"  Open Interest: {oi_btc:.2f} BTC (${oi_usd:,.0f})")
 
-async def load_derivatives_data() -> int:
-    """Load funding rate and open interest from OKX public API."""
-    db = get_supabase()
     total = 0
-
-    async with httpx.AsyncClient(timeout=30, headers=HEADERS) as client:
-        # --- Funding Rate ---
-        try:
-            resp = await client.get(
-                "https://www.okx.com/api/v5/public/funding-rate",
-                params={"instId": "BTC-USDT-SWAP"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            items = data.get("data", [])
-
-            if items:
-                # settFundingRate = last settled rate, fundingRate = current predicted
-                settled = items[0].get("settFundingRate", "")
-                current = items[0].get("fundingRate", "")
-                rate_str = settled if settled else current
-                funding_rate = float(rate_str) * 100 if rate_str else 0  # to percentage
-
-                record = {
-                    "date": date.today().isoformat(),
-                    "metric": "FUNDING_RATE",
-                    "value": funding_rate,
-                    "signal": _classify_funding_rate(funding_rate),
-                    "source": "okx",
-                }
-                db.table("onchain_metrics").upsert(
-                    record, on_conflict="date,metric"
-                ).execute()
-                total += 1
-                console.print(f"  Funding Rate: {funding_rate:.4f}%")
-        except Exception as e:
-            console.print(f"  [yellow]Funding Rate error: {e}[/yellow]")
-
-        # --- Open Interest ---
+    if records:
         try:
-            resp = await client.get(
-                "https://www.okx.com/api/v5/public/open-interest",
-                params={"instType": "SWAP", "instId": "BTC-USDT-SWAP"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            items = data.get("data", [])
-
-            if items:
-                oi_usd = float(items[0].get("oiUsd", 0))
-
-                record = {
-                    "date": date.today().isoformat(),
-                    "metric": "OPEN_INTEREST",
-                    "value": oi_usd,
-                    "signal": None,  # Signal computed in analysis step
-                    "source": "okx",
-                }
-                db.table("onchain_metrics").upsert(
-                    record, on_conflict="date,metric"
-                ).execute()
-                total += 1
-                oi_btc = float(items[0].get("oiCcy", 0))
-                console.print(f"  Open Interest: {oi_btc:.2f} BTC (${oi_usd:,.0f})")
+            get_supabase().table("onchain_metrics").upsert(
+                records, on_conflict="date,metric"
+            ).execute()
+            total = len(records)
         except Exception as e:
-            console.print(f"  [yellow]Open Interest error: {e}[/yellow]")
+            console.print(f"  [yellow]Derivatives upsert error: {e}[/yellow]")
 
     console.print(f"  [green]Derivatives: {total} metricas actualizadas[/green]")
     return total
 
 
-def _classify_funding_rate(rate_pct: float) -> str:
-    """Quick classification for storage. Detailed analysis in analysis/derivatives.py."""
-    if rate_pct > 0.1:
-        return "extreme_bearish"
-    if rate_pct > 0.03:
-        return "bearish"
-    if rate_pct > -0.03:
-        return "neutral"
-    if rate_pct > -0.05:
-        return "bullish"
-    return "extreme_bullish"
+async def _fetch(client, limiter: TokenBucket, url: str, params: dict, parse):
+    """GET one endpoint within the exchange's quota and parse its JSON body."""
+    async with limiter:
+        resp = await client.get(url, params=params)
+    resp.raise_for_status()
+    return parse(response_json(resp))
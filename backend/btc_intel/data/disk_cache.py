@@ -0,0 +1,64 @@
+"""Disk Cache — Raw upstream payloads kept on disk between loader runs.
+
+Entries live under ``settings.data_dir / "cache"``, one file per
+(namespace, key), and expire ``settings.cache_ttl_hours`` after they were
+written. The cache is a development aid and off by default (TTL 0): a
+scheduled update must always see fresh upstream data. Keys must describe
+the full request (URL, tickers and date range) so a different window never
+reuses a stale body. Expired files are deleted when read and swept from the
+namespace on every write, so old windows do not pile up.
+"""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+
+from btc_intel.config import settings
+
+
+def _path(namespace: str, key: str) -> Path:
+    digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+    return settings.data_dir / "cache" / namespace / digest
+
+
+def load(namespace: str, key: str) -> bytes | None:
+    """Cached payload for ``key``, or None when missing, expired or disabled."""
+    ttl = settings.cache_ttl_hours * 3600
+    if ttl <= 0:
+        return None
+    path = _path(namespace, key)
+    try:
+        if time.time() - path.stat().st_mtime > ttl:
+            path.unlink(missing_ok=True)
+            return None
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def _sweep(directory: Path, ttl: float) -> None:
+    """Delete entries in ``directory`` older than ``ttl`` seconds."""
+    cutoff = time.time() - ttl
+    for entry in directory.iterdir():
+        try:
+            if entry.stat().st_mtime < cutoff:
+                entry.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def store(namespace: str, key: str, payload: bytes) -> None:
+    """Write ``payload`` for ``key``. Best effort: I/O errors are ignored."""
+    if settings.cache_ttl_hours <= 0:
+        return
+    path = _path(namespace, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so a concurrent reader never sees a partial file
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(payload)
+        tmp.replace(path)
+        _sweep(path.parent, settings.cache_ttl_hours * 3600)
+    except OSError:
+        pass
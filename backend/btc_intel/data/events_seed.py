@@ -1,12 +1,15 @@
 """Events Seed — Load curated historical events."""
 
+from types import MappingProxyType
+
+from postgrest.exceptions import APIError
 from rich.console import Console
 
-from btc_intel.db import get_supabase
+from btc_intel.db import NO_CONFLICT_TARGET, get_supabase
 
 console = Console()
 
-EVENTS = [
+_EVENTS_RAW = [
     # Halvings
     {"date": "2012-11-28", "title": "1st Bitcoin Halving", "description": "Block reward: 50 → 25 BTC. Price: ~$12", "category": "halving", "impact": "positive", "btc_price": 12.35},
     {"date": "2016-07-09", "title": "2nd Bitcoin Halving", "description": "Block reward: 25 → 12.5 BTC. Price: ~$650", "category": "halving", "impact": "positive", "btc_price": 650.63},
@@ -42,30 +45,53 @@ EVENTS = [
     {"date": "2024-12-05", "title": "BTC Breaks $100,000", "description": "Bitcoin surpasses $100K for the first time.", "category": "technical", "impact": "positive", "btc_price": 100000.00},
 ]
 
+# Read-only view shared by every importer; seeds copy rows to dicts to send them
+EVENTS = tuple(MappingProxyType(row) for row in _EVENTS_RAW)
+
 
 def seed_events() -> int:
     """Load historical events into Supabase."""
     db = get_supabase()
     console.print("[cyan]Loading historical events...[/cyan]")
 
-    inserted = 0
-    for event in EVENTS:
-        try:
-            # Check if exists
-            existing = (
-                db.table("events")
-                .select("id")
-                .eq("date", event["date"])
-                .eq("title", event["title"])
-                .execute()
-            )
-            if existing.data:
-                continue
-
-            db.table("events").insert(event).execute()
-            inserted += 1
-        except Exception as e:
-            console.print(f"  [red]Error: {event['title']} — {e}[/red]")
+    # One request for the whole list; rows already present (migration 016
+    # unique key) are skipped and only new rows come back
+    try:
+        res = (
+            db.table("events")
+            .upsert([dict(row) for row in EVENTS], on_conflict="date,title",
+                    ignore_duplicates=True, default_to_null=False)
+            .execute()
+        )
+        inserted = len(res.data or [])
+    except APIError as e:
+        if e.code != NO_CONFLICT_TARGET:
+            raise
+        # Unique key not deployed: fetch existing keys once, insert the rest
+        inserted = _insert_missing(db)
 
     console.print(f"[green]Events: {inserted} new of {len(EVENTS)} total[/green]")
     return inserted
+
+
+def _insert_missing(db) -> int:
+    """Two-request fallback: one SELECT ... IN for existing keys, one bulk insert."""
+    try:
+        existing = (
+            db.table("events")
+            .select("date,title")
+            .in_("date", sorted({e["date"] for e in EVENTS}))
+            .in_("title", sorted({e["title"] for e in EVENTS}))
+            .execute()
+        )
+        # The two IN filters over-match across pairs; the set narrows it down
+        have = {(r["date"], r["title"]) for r in existing.data or []}
+        missing = [e for e in EVENTS if (e["date"], e["title"]) not in have]
+        if missing:
+            db.table("events").insert(
+                [dict(row) for row in missing], default_to_null=False
+            ).execute()
+        return len(missing)
+    except Exception as e:
+        console.print(f"  [red]Error: {e}[/red]")
+        return 0
@@ -0,0 +1,80 @@
+"""HTTP Client — One pooled httpx.AsyncClient shared by the data loaders."""
+
+import asyncio
+import json
+import time
+
+import httpx
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # optional: pip install -e ".[fast]"
+    _loads = json.loads
+
+HEADERS = {"User-Agent": "btc-intel/1.0"}
+
+_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+
+# Connections belong to the event loop that opened them, so the client is
+# rebuilt if a later asyncio.run() hands us a different loop.
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Shared keep-alive HTTP/2 client for the running event loop."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            http2=True, timeout=30, headers=HEADERS, limits=_LIMITS,
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client. Called by the updater once all loaders ran."""
+    global _client, _client_loop
+    if _client is not None and _client_loop is asyncio.get_running_loop():
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+def response_json(resp: httpx.Response):
+    """Decode a JSON response body, with orjson when it is installed."""
+    return parse_json(resp.content)
+
+
+def parse_json(content: bytes):
+    """Decode a raw JSON body (e.g. one read back from the disk cache)."""
+    return _loads(content)
+
+
+class TokenBucket:
+    """Async rate limiter: ``rate`` requests per second, bursts up to ``capacity``.
+
+    ``async with bucket:`` returns at once while under budget; over budget,
+    each caller reserves the next free slot and sleeps until it comes up, so
+    waiters are served in arrival order. No lock is needed because the
+    bookkeeping runs between awaits on a single event loop.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._stamp = time.monotonic()
+
+    async def __aenter__(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+    async def __aexit__(self, *exc):
+        return False
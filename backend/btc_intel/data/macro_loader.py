@@ -1,13 +1,19 @@
 """Macro Data Loader — SPX, Gold, DXY, US10Y, Fed Rate, M2."""
 
+import asyncio
+import pickle
 from datetime import date, timedelta
+from functools import cache
 
+import numpy as np
 import pandas as pd
 import yfinance as yf
 from rich.console import Console
 
 from btc_intel.config import settings
-from btc_intel.db import get_supabase
+from btc_intel.data import disk_cache
+from btc_intel.data.upsert import series_rows, upsert_rows
+from btc_intel.db import get_supabase, latest_dates
 
 console = Console()
 
@@ -29,93 +35,124 @@ async def load_macro_data(since: date | None = None) -> int:
     db = get_supabase()
     total = 0
 
-    for asset_name, ticker_symbol in YAHOO_ASSETS.items():
-        total += _load_yahoo_asset(db, asset_name, ticker_symbol, since)
-
+    # Resume each asset the day after its last stored row
+    last = {} if since else await asyncio.to_thread(
+        latest_dates, db, "macro_data", "asset", [*YAHOO_ASSETS, *FRED_SERIES],
+    )
+    starts = {
+        name: since or (last[name] + timedelta(days=1) if name in last else date(2012, 1, 1))
+        for name in [*YAHOO_ASSETS, *FRED_SERIES]
+    }
+
+    # yfinance and fredapi block on their sockets: run them on worker threads
+    jobs = [asyncio.to_thread(_load_yahoo_assets, db, starts)]
     if settings.fred_api_key:
-        for asset_name, series_id in FRED_SERIES.items():
-            total += _load_fred_series(db, asset_name, series_id, since)
+        jobs += [
+            asyncio.to_thread(_load_fred_series, db, asset_name, series_id, starts[asset_name])
+            for asset_name, series_id in FRED_SERIES.items()
+        ]
     else:
         console.print("[yellow]FRED_API_KEY no configurada — saltando Fed Rate y M2[/yellow]")
+    total += sum(await asyncio.gather(*jobs))
 
     console.print(f"[green]✅ Macro data: {total} filas totales[/green]")
     return total
 
 
-def _load_yahoo_asset(db, asset_name: str, ticker: str, since: date | None) -> int:
-    """Descarga un activo de Yahoo Finance."""
-    if since is None:
-        result = (
-            db.table("macro_data")
-            .select("date")
-            .eq("asset", asset_name)
-            .order("date", desc=True)
-            .limit(1)
-            .execute()
-        )
-        since = (
-            date.fromisoformat(result.data[0]["date"]) + timedelta(days=1)
-            if result.data
-            else date(2012, 1, 1)
-        )
-
+def _load_yahoo_assets(db, starts: dict[str, date]) -> int:
+    """Descarga todos los activos de Yahoo Finance en una sola petición."""
     today = date.today()
-    if since >= today:
-        console.print(f"  [dim]{asset_name}: already up to date[/dim]")
+    pending = {}
+    for asset_name in YAHOO_ASSETS:
+        asset_since = starts[asset_name]
+        if asset_since >= today:
+            console.print(f"  [dim]{asset_name}: already up to date[/dim]")
+        else:
+            pending[asset_name] = asset_since
+    if not pending:
         return 0
 
-    console.print(f"  [cyan]{asset_name} ({ticker}): {since} → {today}[/cyan]")
+    for asset_name, asset_since in pending.items():
+        console.print(
+            f"  [cyan]{asset_name} ({YAHOO_ASSETS[asset_name]}): {asset_since} → {today}[/cyan]"
+        )
 
+    # One batched download (yfinance fetches the tickers in parallel) from the
+    # oldest start; each asset is trimmed back to its own start below
     try:
-        t = yf.Ticker(ticker)
-        df = t.history(start=str(since), end=str(today + timedelta(days=1)))
-
-        if df.empty:
-            console.print(f"  [yellow]{asset_name}: sin datos nuevos[/yellow]")
-            return 0
+        df = _download(
+            [YAHOO_ASSETS[name] for name in pending],
+            start=str(min(pending.values())),
+            end=str(today + timedelta(days=1)),
+        )
+    except Exception as e:
+        console.print(f"  [red]Yahoo Finance: error — {e}[/red]")
+        return 0
 
-        rows = [
-            {
-                "date": str(idx.date()),
-                "asset": asset_name,
-                "value": round(float(row["Close"]), 4),
-                "source": "yahoo_finance",
-            }
-            for idx, row in df.iterrows()
-        ]
+    total = 0
+    for asset_name, asset_since in pending.items():
+        ticker = YAHOO_ASSETS[asset_name]
+        try:
+            sub = df[ticker] if isinstance(df.columns, pd.MultiIndex) else df
+            # Rows are the union of every ticker's trading days
+            sub = sub.dropna(subset=["Close"])
+            sub = sub[sub.index.date >= asset_since]
+            total += _store_yahoo_asset(db, asset_name, sub)
+        except Exception as e:
+            console.print(f"  [red]{asset_name}: error — {e}[/red]")
+    return total
 
-        inserted = 0
-        for i in range(0, len(rows), 500):
-            batch = rows[i:i + 500]
-            db.table("macro_data").upsert(batch, on_conflict="date,asset").execute()
-            inserted += len(batch)
 
-        console.print(f"  [green]{asset_name}: {inserted} filas[/green]")
-        return inserted
-    except Exception as e:
-        console.print(f"  [red]{asset_name}: error — {e}[/red]")
+def _download(tickers: list[str], start: str, end: str) -> pd.DataFrame:
+    """yf.download of ``tickers``, reused from the disk cache for the same window."""
+    key = f"{','.join(tickers)}|{start}|{end}"
+    cached = disk_cache.load("yahoo", key)
+    if cached is not None:
+        return pickle.loads(cached)
+
+    df = yf.download(
+        tickers,
+        start=start,
+        end=end,
+        group_by="ticker",
+        auto_adjust=True,
+        threads=True,
+        progress=False,
+    )
+    if not df.empty:
+        disk_cache.store("yahoo", key, pickle.dumps(df))
+    return df
+
+
+def _store_yahoo_asset(db, asset_name: str, df: pd.DataFrame) -> int:
+    """Sube los cierres de un activo de Yahoo Finance."""
+    if df.empty:
+        console.print(f"  [yellow]{asset_name}: sin datos nuevos[/yellow]")
         return 0
 
+    rows = series_rows(
+        df.index.strftime("%Y-%m-%d").tolist(),
+        np.round(df["Close"].to_numpy(dtype=np.float64), 4).tolist(),
+        asset=asset_name,
+        source="yahoo_finance",
+    )
 
-def _load_fred_series(db, asset_name: str, series_id: str, since: date | None) -> int:
-    """Descarga una serie de FRED."""
+    inserted = upsert_rows(db, "macro_data", rows, on_conflict="date,asset")
+
+    console.print(f"  [green]{asset_name}: {inserted} filas[/green]")
+    return inserted
+
+
+@cache
+def _fred():
+    """Process-wide FRED client, so its setup happens once for every series."""
     from fredapi import Fred
 
-    if since is None:
-        result = (
-            db.table("macro_data")
-            .select("date")
-            .eq("asset", asset_name)
-            .order("date", desc=True)
-            .limit(1)
-            .execute()
-        )
-        since = (
-            date.fromisoformat(result.data[0]["date"]) + timedelta(days=1)
-            if result.data
-            else date(2012, 1, 1)
-        )
+    return Fred(api_key=settings.fred_api_key)
+
 
+def _load_fred_series(db, asset_name: str, series_id: str, since: date) -> int:
+    """Descarga una serie de FRED."""
     today = date.today()
     if since >= today:
         console.print(f"  [dim]{asset_name}: already up to date[/dim]")
@@ -124,29 +161,21 @@ def _load_fred_series(db, asset_name: str, series_id: str, since: date | None) -
     console.print(f"  [cyan]{asset_name} (FRED {series_id}): {since} → {today}[/cyan]")
 
     try:
-        fred = Fred(api_key=settings.fred_api_key)
-        series = fred.get_series(series_id, observation_start=str(since))
+        series = _fred().get_series(series_id, observation_start=str(since))
 
         if series.empty:
             console.print(f"  [yellow]{asset_name}: sin datos nuevos[/yellow]")
             return 0
 
-        rows = [
-            {
-                "date": str(idx.date()),
-                "asset": asset_name,
-                "value": round(float(value), 4),
-                "source": "fred",
-            }
-            for idx, value in series.items()
-            if pd.notna(value)
-        ]
+        series = series.dropna()
+        rows = series_rows(
+            series.index.strftime("%Y-%m-%d").tolist(),
+            np.round(series.to_numpy(dtype=np.float64), 4).tolist(),
+            asset=asset_name,
+            source="fred",
+        )
 
-        inserted = 0
-        for i in range(0, len(rows), 500):
-            batch = rows[i:i + 500]
-            db.table("macro_data").upsert(batch, on_conflict="date,asset").execute()
-            inserted += len(batch)
+        inserted = upsert_rows(db, "macro_data", rows, on_conflict="date,asset")
 
         console.print(f"  [green]{asset_name}: {inserted} filas[/green]")
         return inserted
@@ -1,92 +1,137 @@
 """On-Chain Data Loader — On-chain metrics from Blockchain.com API."""
 
-from datetime import date, datetime, timedelta
+from datetime import date, timedelta
 
 import asyncio
 import httpx
+import numpy as np
 import pandas as pd
 from rich.console import Console
 
+from btc_intel.data import disk_cache
+from btc_intel.data.http_client import get_client, parse_json
 from btc_intel.data.retry import async_get_with_retry
-from btc_intel.db import get_supabase
+from btc_intel.data.upsert import BULK_THRESHOLD, bulk_upsert, series_rows, upsert_rows
+from btc_intel.db import call_rpc, get_supabase, latest_dates
 
 console = Console()
 
 BLOCKCHAIN_METRICS = {
-    "HASH_RATE": "https://api.blockchain.info/charts/hash-rate?timespan=all&format=json&sampled=true",
-    "ACTIVE_ADDRESSES": "https://api.blockchain.info/charts/n-unique-addresses?timespan=all&format=json&sampled=true",
-    "TRANSACTION_COUNT": "https://api.blockchain.info/charts/n-transactions?timespan=all&format=json&sampled=true",
-    "MARKET_CAP": "https://api.blockchain.info/charts/market-cap?timespan=all&format=json&sampled=true",
-    "MINERS_REVENUE": "https://api.blockchain.info/charts/miners-revenue?timespan=all&format=json&sampled=true",
-    "DIFFICULTY": "https://api.blockchain.info/charts/difficulty?timespan=all&format=json&sampled=true",
+    "HASH_RATE": "https://api.blockchain.info/charts/hash-rate?format=json&sampled=true",
+    "ACTIVE_ADDRESSES": "https://api.blockchain.info/charts/n-unique-addresses?format=json&sampled=true",
+    "TRANSACTION_COUNT": "https://api.blockchain.info/charts/n-transactions?format=json&sampled=true",
+    "MARKET_CAP": "https://api.blockchain.info/charts/market-cap?format=json&sampled=true",
+    "MINERS_REVENUE": "https://api.blockchain.info/charts/miners-revenue?format=json&sampled=true",
+    "DIFFICULTY": "https://api.blockchain.info/charts/difficulty?format=json&sampled=true",
 }
 
+MAX_CONCURRENT = 3
+# Chart windows blockchain.com serves, smallest first: incremental runs ask
+# for the smallest one covering their start instead of timespan=all (~5 MB)
+TIMESPANS = ((30, "30days"), (180, "180days"), (365, "1year"), (3 * 365, "3years"))
+
 
 async def load_onchain_data(since: date | None = None) -> int:
     """Descarga métricas on-chain y las sube a Supabase."""
     db = get_supabase()
     total = 0
 
-    async with httpx.AsyncClient(timeout=60) as client:
-        for metric_name, url in BLOCKCHAIN_METRICS.items():
-            count = await _load_blockchain_metric(db, client, metric_name, url, since)
+    # Resume each metric the day after its last stored row
+    last = {} if since else await asyncio.to_thread(
+        latest_dates, db, "onchain_metrics", "metric", list(BLOCKCHAIN_METRICS),
+    )
+
+    # At most MAX_CONCURRENT requests in flight to blockchain.com at a time
+    sem = asyncio.Semaphore(MAX_CONCURRENT)
+
+    async def load(metric_name: str, url: str) -> int:
+        async with sem:
+            start = since or (
+                last[metric_name] + timedelta(days=1) if metric_name in last else None
+            )
+            return await _load_blockchain_metric(db, client, metric_name, url, start)
+
+    client = get_client()
+    counts = await asyncio.gather(
+        *(load(name, url) for name, url in BLOCKCHAIN_METRICS.items()),
+        return_exceptions=True,
+    )
+    for metric_name, count in zip(BLOCKCHAIN_METRICS, counts):
+        if isinstance(count, Exception):
+            console.print(f"  [red]{metric_name}: error — {count}[/red]")
+        else:
             total += count
-            await asyncio.sleep(1)
 
     # Métricas derivadas
-    total += _calculate_nvt(db, since)
+    total += await asyncio.to_thread(_calculate_nvt, db, since)
 
     console.print(f"[green]✅ On-chain data: {total} filas totales[/green]")
     return total
 
 
+def _timespan(since: date | None, today: date) -> str:
+    """Smallest chart window that still includes ``since``."""
+    if since is not None:
+        for days, label in TIMESPANS:
+            if since > today - timedelta(days=days):
+                return label
+    return "all"
+
+
 async def _load_blockchain_metric(
     db, client: httpx.AsyncClient, metric_name: str, url: str, since: date | None
 ) -> int:
-    """Descarga una métrica de Blockchain.com."""
-    if since is None:
-        result = (
-            db.table("onchain_metrics")
-            .select("date")
-            .eq("metric", metric_name)
-            .order("date", desc=True)
-            .limit(1)
-            .execute()
-        )
-        if result.data:
-            since = date.fromisoformat(result.data[0]["date"]) + timedelta(days=1)
+    """Descarga una métrica de Blockchain.com desde ``since`` (todo el histórico si None)."""
+    today = date.today()
+    # Daily charts: nothing new to fetch until the day after the last stored row
+    if since and since >= today:
+        console.print(f"  [dim]{metric_name}: already up to date[/dim]")
+        return 0
 
     console.print(f"  [cyan]{metric_name}: descargando...[/cyan]")
 
+    url = f"{url}&timespan={_timespan(since, today)}"
+
     try:
-        resp = await async_get_with_retry(client, url)
-        data = resp.json()
+        content = disk_cache.load("blockchain", url)
+        if content is None:
+            # Full-history charts are large; allow more than the shared 30 s default
+            resp = await async_get_with_retry(client, url, timeout=60)
+            content = resp.content
+            disk_cache.store("blockchain", url, content)
+        data = parse_json(content)
 
         if "values" not in data:
             console.print(f"  [yellow]{metric_name}: sin datos[/yellow]")
             return 0
 
-        rows = []
-        for point in data["values"]:
-            d = datetime.fromtimestamp(point["x"]).date()
-            if since and d < since:
-                continue
-            rows.append({
-                "date": str(d),
-                "metric": metric_name,
-                "value": round(float(point["y"]), 8),
-                "source": "blockchain_com",
-            })
+        points = pd.DataFrame(data["values"], columns=["x", "y"])
+        if since:
+            # Mask on the raw epoch seconds so only new points get converted
+            points = points[points["x"] >= pd.Timestamp(since, tz="UTC").timestamp()]
+        # Points are stamped at 00:00 UTC
+        days = pd.to_datetime(points["x"], unit="s").dt.normalize()
+        rows = series_rows(
+            days.dt.strftime("%Y-%m-%d").tolist(),
+            np.round(points["y"].to_numpy(dtype=np.float64), 8).tolist(),
+            metric=metric_name,
+            source="blockchain_com",
+        )
 
         if not rows:
             console.print(f"  [dim]{metric_name}: sin datos nuevos[/dim]")
             return 0
 
-        inserted = 0
-        for i in range(0, len(rows), 500):
-            batch = rows[i:i + 500]
-            db.table("onchain_metrics").upsert(batch, on_conflict="date,metric").execute()
-            inserted += len(batch)
+        # Backfills go through COPY when a direct connection is configured
+        inserted = (
+            await bulk_upsert("onchain_metrics", rows, "date,metric")
+            if len(rows) > BULK_THRESHOLD else None
+        )
+        if inserted is None:
+            # Sync DB write off the loop so the other metric downloads keep going
+            inserted = await asyncio.to_thread(
+                upsert_rows, db, "onchain_metrics", rows, on_conflict="date,metric",
+            )
 
         console.print(f"  [green]{metric_name}: {inserted} filas[/green]")
         return inserted
@@ -98,9 +143,22 @@ async def _load_blockchain_metric(
 def _calculate_nvt(db, since: date | None) -> int:
     """Calcula NVT ratio = Market Cap / TX Count."""
     console.print("  [cyan]NVT_RATIO: calculando...[/cyan]")
+
+    # Join + upsert server-side when compute_nvt (migration 018) is deployed
+    written = call_rpc(db, "compute_nvt", {"since_date": str(since) if since else None})
+    if written is not None:
+        console.print(f"  [green]NVT_RATIO: {written} filas[/green]")
+        return written
+
     try:
-        mc = db.table("onchain_metrics").select("date,value").eq("metric", "MARKET_CAP").order("date").execute()
-        tx = db.table("onchain_metrics").select("date,value").eq("metric", "TRANSACTION_COUNT").order("date").execute()
+        def series(metric: str):
+            query = db.table("onchain_metrics").select("date,value").eq("metric", metric)
+            if since:
+                query = query.gte("date", str(since))
+            return query.order("date").execute()
+
+        mc = series("MARKET_CAP")
+        tx = series("TRANSACTION_COUNT")
 
         if not mc.data or not tx.data:
             return 0
@@ -108,28 +166,17 @@ def _calculate_nvt(db, since: date | None) -> int:
         mc_df = pd.DataFrame(mc.data).rename(columns={"value": "mc"})
         tx_df = pd.DataFrame(tx.data).rename(columns={"value": "tx"})
         merged = mc_df.merge(tx_df, on="date")
-        merged["mc"] = merged["mc"].astype(float)
         merged["tx"] = merged["tx"].astype(float).replace(0, float("nan"))
-        merged["nvt"] = merged["mc"] / merged["tx"]
-
-        rows = []
-        for _, row in merged.iterrows():
-            if pd.notna(row["nvt"]) and (since is None or date.fromisoformat(row["date"]) >= since):
-                rows.append({
-                    "date": row["date"],
-                    "metric": "NVT_RATIO",
-                    "value": round(float(row["nvt"]), 8),
-                    "source": "calculated",
-                })
+        merged["value"] = (merged["mc"].astype(float) / merged["tx"]).round(8)
+        merged = merged.dropna(subset=["value"])
+        merged["metric"] = "NVT_RATIO"
+        merged["source"] = "calculated"
+        rows = merged[["date", "metric", "value", "source"]].to_dict(orient="records")
 
         if not rows:
             return 0
 
-        inserted = 0
-        for i in range(0, len(rows), 500):
-            batch = rows[i:i + 500]
-            db.table("onchain_metrics").upsert(batch, on_conflict="date,metric").execute()
-            inserted += len(batch)
+        inserted = upsert_rows(db, "onchain_metrics", rows, on_conflict="date,metric")
 
         console.print(f"  [green]NVT_RATIO: {inserted} filas[/green]")
         return inserted
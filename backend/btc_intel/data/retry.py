@@ -1,7 +1,9 @@
 """Retry utility — Exponential backoff for HTTP requests."""
 
 import asyncio
+import random
 import time
+from email.utils import parsedate_to_datetime
 
 import httpx
 from rich.console import Console
@@ -9,7 +11,60 @@ from rich.console import Console
 console = Console()
 
 MAX_RETRIES = 3
-BASE_DELAY = 1  # seconds — delays: 1s, 2s, 4s
+BASE_DELAY = 1  # seconds — delays drawn from [0, 1s], [0, 2s], [0, 4s]
+# Longest Retry-After we wait out; asking for more gives up on the request,
+# since the whole concurrent update would otherwise stall behind it
+MAX_RETRY_AFTER = 60  # seconds
+
+MAX_PER_HOST = 4  # in-flight requests per host across every concurrent loader
+
+# Semaphores belong to the event loop that first waits on them, so the map is
+# reset when a later asyncio.run() brings a different loop (as in http_client)
+_HOST_SEMS: dict[str, asyncio.Semaphore] = {}
+_sems_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _host_slot(url: str) -> asyncio.Semaphore:
+    """Shared semaphore capping concurrent requests to ``url``'s host."""
+    global _sems_loop
+    loop = asyncio.get_running_loop()
+    if _sems_loop is not loop:
+        _HOST_SEMS.clear()
+        _sems_loop = loop
+    host = httpx.URL(url).host
+    sem = _HOST_SEMS.get(host)
+    if sem is None:
+        sem = _HOST_SEMS[host] = asyncio.Semaphore(MAX_PER_HOST)
+    return sem
+
+
+def _should_retry(resp: httpx.Response) -> bool:
+    """Server errors and rate limiting (429) are worth another attempt."""
+    return resp.status_code >= 500 or resp.status_code == 429
+
+
+def _backoff(
+    attempt: int, base_delay: float, resp: httpx.Response | None = None,
+) -> float | None:
+    """Full-jitter exponential delay, never shorter than the server's Retry-After.
+
+    Random delays keep concurrent loaders from retrying in lockstep. Returns
+    None (do not retry) when Retry-After exceeds MAX_RETRY_AFTER.
+    """
+    delay = random.uniform(0, base_delay * (2 ** attempt))
+    retry_after = resp.headers.get("Retry-After") if resp is not None else None
+    if retry_after:
+        try:
+            wait = float(retry_after)
+        except ValueError:  # HTTP-date form
+            try:
+                wait = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                wait = 0
+        if wait > MAX_RETRY_AFTER:
+            return None
+        delay = max(delay, wait)
+    return delay
 
 
 async def async_get_with_retry(
@@ -18,23 +73,31 @@ async def async_get_with_retry(
     *,
     max_retries: int = MAX_RETRIES,
     base_delay: float = BASE_DELAY,
+    timeout: float | None = None,
 ) -> httpx.Response:
     """Async HTTP GET with exponential backoff retry.
 
-    Retries on connection errors and 5xx status codes.
-    Delays: 1s, 2s, 4s (exponential backoff).
+    Retries on connection errors, 5xx and 429 status codes, with jittered
+    exponential backoff that honors Retry-After up to MAX_RETRY_AFTER; a
+    longer Retry-After raises the status error at once. At most
+    MAX_PER_HOST calls per host are in flight at once. ``timeout``
+    overrides the client's default for this request only.
     """
     last_exception = None
 
     for attempt in range(max_retries + 1):
         try:
-            resp = await client.get(url)
+            # Hold the host slot for the request only, not for the backoff sleep
+            async with _host_slot(url):
+                resp = await client.get(
+                    url, timeout=httpx.USE_CLIENT_DEFAULT if timeout is None else timeout,
+                )
 
-            # Retry on server errors (5xx)
-            if resp.status_code >= 500 and attempt < max_retries:
-                delay = base_delay * (2 ** attempt)
+            # Retry on server errors (5xx) and rate limiting (429)
+            delay = _backoff(attempt, base_delay, resp) if _should_retry(resp) else None
+            if delay is not None and attempt < max_retries:
                 console.print(
-                    f"  [yellow]HTTP {resp.status_code} — reintentando en {delay}s "
+                    f"  [yellow]HTTP {resp.status_code} — reintentando en {delay:.1f}s "
                     f"(intento {attempt + 1}/{max_retries})[/yellow]"
                 )
                 await asyncio.sleep(delay)
@@ -46,9 +109,9 @@ async def async_get_with_retry(
         except (httpx.ConnectError, httpx.TimeoutException, httpx.ReadTimeout) as e:
             last_exception = e
             if attempt < max_retries:
-                delay = base_delay * (2 ** attempt)
+                delay = _backoff(attempt, base_delay)
                 console.print(
-                    f"  [yellow]{type(e).__name__} — reintentando en {delay}s "
+                    f"  [yellow]{type(e).__name__} — reintentando en {delay:.1f}s "
                     f"(intento {attempt + 1}/{max_retries})[/yellow]"
                 )
                 await asyncio.sleep(delay)
@@ -56,7 +119,7 @@ async def async_get_with_retry(
                 raise
 
         except httpx.HTTPStatusError:
-            # Non-5xx errors (4xx) should not be retried
+            # Other 4xx errors should not be retried
             raise
 
     # Should not reach here, but just in case
@@ -74,7 +137,7 @@ def sync_get_with_retry(
 ) -> httpx.Response:
     """Sync HTTP GET with exponential backoff retry.
 
-    For use in non-async contexts.
+    For use in non-async contexts. Same retry policy as async_get_with_retry.
     """
     last_exception = None
 
@@ -82,10 +145,10 @@ def sync_get_with_retry(
         try:
             resp = httpx.get(url, timeout=timeout)
 
-            if resp.status_code >= 500 and attempt < max_retries:
-                delay = base_delay * (2 ** attempt)
+            delay = _backoff(attempt, base_delay, resp) if _should_retry(resp) else None
+            if delay is not None and attempt < max_retries:
                 console.print(
-                    f"  [yellow]HTTP {resp.status_code} — reintentando en {delay}s "
+                    f"  [yellow]HTTP {resp.status_code} — reintentando en {delay:.1f}s "
                     f"(intento {attempt + 1}/{max_retries})[/yellow]"
                 )
                 time.sleep(delay)
@@ -97,9 +160,9 @@ def sync_get_with_retry(
         except (httpx.ConnectError, httpx.TimeoutException, httpx.ReadTimeout) as e:
             last_exception = e
             if attempt < max_retries:
-                delay = base_delay * (2 ** attempt)
+                delay = _backoff(attempt, base_delay)
                 console.print(
-                    f"  [yellow]{type(e).__name__} — reintentando en {delay}s "
+                    f"  [yellow]{type(e).__name__} — reintentando en {delay:.1f}s "
                     f"(intento {attempt + 1}/{max_retries})[/yellow]"
                 )
                 time.sleep(delay)
@@ -1,12 +1,16 @@
 """Sentiment Data Loader — Fear & Greed Index + Google Trends."""
 
-from datetime import date, datetime, timedelta
+import asyncio
+from datetime import date, timedelta
+from functools import cache
 
-import httpx
+import pandas as pd
 from rich.console import Console
 
+from btc_intel.data.http_client import get_client, response_json
 from btc_intel.data.retry import async_get_with_retry
-from btc_intel.db import get_supabase
+from btc_intel.data.upsert import upsert_rows
+from btc_intel.db import get_supabase, latest_dates
 
 console = Console()
 
@@ -18,8 +22,20 @@ async def load_sentiment_data(since: date | None = None) -> int:
     db = get_supabase()
     total = 0
 
-    total += await _load_fear_greed(db, since)
-    total += _load_google_trends(db, since)
+    # Resume each metric the day after its last stored row
+    last = {} if since else await asyncio.to_thread(
+        latest_dates, db, "sentiment_data", "metric", ["FEAR_GREED", "GOOGLE_TRENDS"],
+    )
+    starts = {
+        metric: since or (last[metric] + timedelta(days=1) if metric in last else None)
+        for metric in ("FEAR_GREED", "GOOGLE_TRENDS")
+    }
+
+    # pytrends is blocking: run it on a worker thread alongside the async fetch
+    total += sum(await asyncio.gather(
+        _load_fear_greed(db, starts["FEAR_GREED"]),
+        asyncio.to_thread(_load_google_trends, db, starts["GOOGLE_TRENDS"]),
+    ))
 
     console.print(f"[green]✅ Sentiment data: {total} filas totales[/green]")
     return total
@@ -27,51 +43,39 @@ async def load_sentiment_data(since: date | None = None) -> int:
 
 async def _load_fear_greed(db, since: date | None) -> int:
     """Descarga Fear & Greed Index desde alternative.me."""
-    if since is None:
-        result = (
-            db.table("sentiment_data")
-            .select("date")
-            .eq("metric", "FEAR_GREED")
-            .order("date", desc=True)
-            .limit(1)
-            .execute()
-        )
-        if result.data:
-            since = date.fromisoformat(result.data[0]["date"]) + timedelta(days=1)
-
     console.print("  [cyan]FEAR_GREED: descargando...[/cyan]")
 
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await async_get_with_retry(client, FEAR_GREED_URL)
-            data = resp.json()
+        resp = await async_get_with_retry(get_client(), FEAR_GREED_URL)
+        data = response_json(resp)
 
         if "data" not in data:
             console.print("  [yellow]FEAR_GREED: respuesta inesperada[/yellow]")
             return 0
 
-        rows = []
-        for entry in data["data"]:
-            d = datetime.fromtimestamp(int(entry["timestamp"])).date()
-            if since and d < since:
-                continue
-            rows.append({
-                "date": str(d),
-                "metric": "FEAR_GREED",
-                "value": int(entry["value"]),
-                "label": entry.get("value_classification", ""),
-                "source": "alternative_me",
-            })
+        entries = pd.DataFrame(
+            data["data"], columns=["timestamp", "value", "value_classification"],
+        )
+        # Daily values are stamped at 00:00 UTC
+        days = pd.to_datetime(entries["timestamp"].astype(int), unit="s").dt.normalize()
+        if since:
+            keep = days >= pd.Timestamp(since)
+            entries, days = entries[keep], days[keep]
+        rows = pd.DataFrame({
+            "date": days.dt.strftime("%Y-%m-%d"),
+            "metric": "FEAR_GREED",
+            "value": entries["value"].astype(int),
+            "label": entries["value_classification"].fillna(""),
+            "source": "alternative_me",
+        }).to_dict(orient="records")
 
         if not rows:
             console.print("  [dim]FEAR_GREED: sin datos nuevos[/dim]")
             return 0
 
-        inserted = 0
-        for i in range(0, len(rows), 500):
-            batch = rows[i:i + 500]
-            db.table("sentiment_data").upsert(batch, on_conflict="date,metric").execute()
-            inserted += len(batch)
+        inserted = await asyncio.to_thread(
+            upsert_rows, db, "sentiment_data", rows, on_conflict="date,metric",
+        )
 
         console.print(f"  [green]FEAR_GREED: {inserted} filas[/green]")
         return inserted
@@ -80,59 +84,48 @@ async def _load_fear_greed(db, since: date | None) -> int:
         return 0
 
 
+@cache
+def _trends():
+    """Process-wide pytrends session; building one fetches Google cookies."""
+    from pytrends.request import TrendReq
+
+    return TrendReq(hl="en-US", tz=0)
+
+
 def _load_google_trends(db, since: date | None) -> int:
     """Descarga Google Trends para 'bitcoin'."""
     try:
-        from pytrends.request import TrendReq
+        import pytrends  # noqa: F401
     except ImportError:
         console.print("  [yellow]pytrends no disponible, saltando Google Trends[/yellow]")
         return 0
 
-    if since is None:
-        result = (
-            db.table("sentiment_data")
-            .select("date")
-            .eq("metric", "GOOGLE_TRENDS")
-            .order("date", desc=True)
-            .limit(1)
-            .execute()
-        )
-        if result.data:
-            since = date.fromisoformat(result.data[0]["date"]) + timedelta(days=1)
-
     console.print("  [cyan]GOOGLE_TRENDS: descargando...[/cyan]")
 
     try:
-        pytrends = TrendReq(hl="en-US", tz=0)
-        pytrends.build_payload(["bitcoin"], timeframe="all")
-        df = pytrends.interest_over_time()
+        trends = _trends()
+        trends.build_payload(["bitcoin"], timeframe="all")
+        df = trends.interest_over_time()
 
         if df.empty:
             console.print("  [yellow]GOOGLE_TRENDS: sin datos[/yellow]")
             return 0
 
-        rows = []
-        for idx, row in df.iterrows():
-            d = idx.date()
-            if since and d < since:
-                continue
-            rows.append({
-                "date": str(d),
-                "metric": "GOOGLE_TRENDS",
-                "value": int(row["bitcoin"]),
-                "label": None,
-                "source": "google_trends",
-            })
+        if since:
+            df = df[df.index.date >= since]
+        rows = pd.DataFrame({
+            "date": df.index.strftime("%Y-%m-%d"),
+            "metric": "GOOGLE_TRENDS",
+            "value": df["bitcoin"].astype(int).to_numpy(),
+            "label": None,
+            "source": "google_trends",
+        }).to_dict(orient="records")
 
         if not rows:
             console.print("  [dim]GOOGLE_TRENDS: sin datos nuevos[/dim]")
             return 0
 
-        inserted = 0
-        for i in range(0, len(rows), 500):
-            batch = rows[i:i + 500]
-            db.table("sentiment_data").upsert(batch, on_conflict="date,metric").execute()
-            inserted += len(batch)
+        inserted = upsert_rows(db, "sentiment_data", rows, on_conflict="date,metric")
 
         console.print(f"  [green]GOOGLE_TRENDS: {inserted} filas[/green]")
         return inserted
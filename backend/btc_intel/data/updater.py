@@ -8,46 +8,56 @@ from btc_intel.data.btc_loader import load_btc_prices, load_btc_hourly
 from btc_intel.data.macro_loader import load_macro_data
 from btc_intel.data.onchain_loader import load_onchain_data
 from btc_intel.data.sentiment_loader import load_sentiment_data
-from btc_intel.data.derivatives_loader import load_derivatives_data
+from btc_intel.data.derivatives_loader import load_derivatives_hedged
+from btc_intel.data.http_client import close_client
 
 console = Console()
 
 
-async def update_all() -> dict:
-    """Update all data incrementally."""
-    console.print("[bold cyan]═══ Updating ALL data ═══[/bold cyan]\n")
-    results = {}
+# Each loader talks to its own upstream (Yahoo, FRED, blockchain.com,
+# alternative.me, OKX), so update_all runs them concurrently
+LOADERS = {
+    "btc": ("BTC Prices (Daily)", load_btc_prices),
+    "btc_hourly": ("BTC Prices (Hourly)", load_btc_hourly),
+    "macro": ("Macro Data", load_macro_data),
+    "onchain": ("On-Chain Data", load_onchain_data),
+    "sentiment": ("Sentiment Data", load_sentiment_data),
+    "derivatives": ("Derivatives Data", load_derivatives_hedged),
+}
 
-    # BTC prices (daily)
-    console.print("[bold]BTC Prices (Daily)[/bold]")
-    results["btc"] = await load_btc_prices()
-    console.print()
 
-    # BTC prices (hourly)
-    console.print("[bold]BTC Prices (Hourly)[/bold]")
-    results["btc_hourly"] = await load_btc_hourly()
-    console.print()
+async def _run(category: str) -> int:
+    """Run one loader between labelled start/end lines.
 
-    # Macro data
-    console.print("[bold]Macro Data[/bold]")
-    results["macro"] = await load_macro_data()
-    console.print()
+    Concurrent loaders interleave their output, so the labels mark which
+    section each stretch of lines and each row count belongs to.
+    """
+    label, loader = LOADERS[category]
+    console.print(f"[bold]▶ {label}[/bold]")
+    count = await loader()
+    console.print(f"[bold]■ {label}:[/bold] {count} rows")
+    return count
 
-    # On-chain
-    console.print("[bold]On-Chain Data[/bold]")
-    results["onchain"] = await load_onchain_data()
-    console.print()
 
-    # Sentiment
-    console.print("[bold]Sentiment Data[/bold]")
-    results["sentiment"] = await load_sentiment_data()
-    console.print()
+async def update_all() -> dict:
+    """Update all data incrementally."""
+    console.print("[bold cyan]═══ Updating ALL data ═══[/bold cyan]\n")
 
-    # Derivatives (Funding Rate, Open Interest)
-    console.print("[bold]Derivatives Data[/bold]")
-    results["derivatives"] = await load_derivatives_data()
-    console.print()
+    try:
+        counts = await asyncio.gather(
+            *(_run(category) for category in LOADERS), return_exceptions=True,
+        )
+    finally:
+        await close_client()
+
+    results = {}
+    for name, count in zip(LOADERS, counts):
+        if isinstance(count, Exception):
+            console.print(f"[red]{LOADERS[name][0]}: error — {count}[/red]")
+            count = 0
+        results[name] = count
 
+    console.print()
     total = sum(results.values())
     console.print(f"[bold green]═══ Total: {total} rows updated ═══[/bold green]")
     return results
@@ -55,18 +65,13 @@ async def update_all() -> dict:
 
 async def update_only(category: str) -> int:
     """Update a single category."""
-    loaders = {
-        "btc": load_btc_prices,
-        "btc_hourly": load_btc_hourly,
-        "macro": load_macro_data,
-        "onchain": load_onchain_data,
-        "sentiment": load_sentiment_data,
-        "derivatives": load_derivatives_data,
-    }
-
-    if category not in loaders:
+    if category not in LOADERS:
         console.print(f"[red]Unknown category: {category}[/red]")
-        console.print(f"[dim]Options: {', '.join(loaders.keys())}[/dim]")
+        console.print(f"[dim]Options: {', '.join(LOADERS.keys())}[/dim]")
         return 0
 
-    return await loaders[category]()
+    try:
+        count = await _run(category)
+    finally:
+        await close_client()
+    return count
@@ -0,0 +1,128 @@
+"""Batched upserts — PostgREST writes for the data loaders."""
+
+import asyncio
+from datetime import date
+from decimal import Decimal
+
+from rich.console import Console
+
+from btc_intel.config import settings
+
+console = Console()
+
+# Rows per request: backfills of a few thousand narrow rows take one or two
+# requests instead of dozens, well under the PostgREST request-size limit
+BATCH_SIZE = 5000
+# Above this many rows (backfills) loaders prefer COPY over PostgREST
+BULK_THRESHOLD = 5000
+MAX_CONCURRENCY = 4  # in-flight batches; keeps the Supabase pool from saturating
+
+
+def series_rows(dates, values, **fields) -> list[dict]:
+    """Rows ``{"date", "value", **fields}`` from parallel date/value sequences.
+
+    Pass plain lists (``.tolist()``): building dicts from Python scalars is
+    several times faster than ``DataFrame.to_dict(orient="records")``.
+    """
+    return [{"date": d, "value": v, **fields} for d, v in zip(dates, values)]
+
+
+async def upsert_batches(
+    db,
+    table: str,
+    rows: list[dict],
+    on_conflict: str,
+    *,
+    label: str = "batch",
+    batch_size: int = BATCH_SIZE,
+    concurrency: int = MAX_CONCURRENCY,
+) -> int:
+    """Upsert ``rows`` in batches, several at a time. Returns rows written.
+
+    The sync Supabase client runs in worker threads; a failed batch is
+    reported and skipped, like the sequential loops this replaces.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def send(batch: list[dict]) -> int:
+        async with sem:
+            await asyncio.to_thread(
+                db.table(table).upsert(batch, on_conflict=on_conflict).execute
+            )
+        return len(batch)
+
+    batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+    results = await asyncio.gather(*(send(b) for b in batches), return_exceptions=True)
+
+    inserted = 0
+    for result in results:
+        if isinstance(result, Exception):
+            console.print(f"[red]Error upserting {label}: {result}[/red]")
+        else:
+            inserted += result
+    return inserted
+
+
+def upsert_rows(db, table: str, rows: list[dict], on_conflict: str, *,
+                batch_size: int = BATCH_SIZE) -> int:
+    """Upsert ``rows`` in sequential batches from sync code. Returns rows written.
+
+    Errors propagate; the loaders report them per series.
+    """
+    for i in range(0, len(rows), batch_size):
+        db.table(table).upsert(rows[i:i + batch_size], on_conflict=on_conflict).execute()
+    return len(rows)
+
+
+async def bulk_upsert(table: str, rows: list[dict], on_conflict: str) -> int | None:
+    """COPY ``rows`` into a temp table and merge them into ``btc_hub.<table>``.
+
+    Every column present in the rows other than the ``on_conflict`` key is
+    updated on conflict. Returns None (caller falls back to PostgREST) when
+    DATABASE_URL or asyncpg is not available, or the bulk path fails.
+    """
+    if not settings.database_url or not rows:
+        return None
+    try:
+        import asyncpg
+    except ImportError:
+        console.print("  [yellow]asyncpg no disponible, usando PostgREST[/yellow]")
+        return None
+
+    columns = list(rows[0])
+    keys = on_conflict.split(",")
+    staging = f"{table}_staging"
+    col_list = ", ".join(columns)
+    merge = (
+        f"INSERT INTO btc_hub.{table} ({col_list}) SELECT {col_list} FROM {staging} "
+        f"ON CONFLICT ({on_conflict}) DO UPDATE SET "
+        + ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c not in keys)
+    )
+    records = [tuple(_pg_value(c, row[c]) for c in columns) for row in rows]
+    try:
+        conn = await asyncpg.connect(settings.database_url)
+        try:
+            async with conn.transaction():
+                await conn.execute(
+                    f"CREATE TEMP TABLE {staging} "
+                    f"(LIKE btc_hub.{table} INCLUDING DEFAULTS) ON COMMIT DROP"
+                )
+                await conn.copy_records_to_table(staging, records=records, columns=columns)
+                await conn.execute(merge)
+        finally:
+            await conn.close()
+    except Exception as e:
+        console.print(f"[yellow]Bulk COPY falló ({e}), usando PostgREST[/yellow]")
+        return None
+    return len(records)
+
+
+def _pg_value(column: str, value):
+    """JSON-ready row value -> the Python type asyncpg's COPY expects."""
+    if value is None:
+        return None
+    if column == "date":
+        return date.fromisoformat(value)
+    if isinstance(value, float):
+        return Decimal(str(value))  # DECIMAL columns
+    return value
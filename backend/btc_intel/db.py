@@ -1,28 +1,95 @@
 """Supabase client singleton."""
 
+import threading
+from datetime import date
+
+import httpx
+from postgrest.exceptions import APIError
 from supabase import create_client, Client
 from supabase.lib.client_options import SyncClientOptions
 
 from btc_intel.config import settings
 
 _client: Client | None = None
+# Context renders and seed-all call get_supabase() from worker threads
+_client_lock = threading.Lock()
 
 # Schema independiente para BTC Intelligence Hub
 SCHEMA = "btc_hub"
 
+# One pooled HTTP/2 client for every PostgREST call: context renders fan out
+# on a thread pool, so connections are reused instead of re-handshaking TLS.
+_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60)
+_HTTP_TIMEOUT = 120
+
+# PostgREST's "function not in the schema cache"; a non-JSON 404 carries the
+# bare status code instead
+_MISSING_FUNCTION = ("PGRST202", 404, "404")
+# Postgres: no unique constraint matches the ON CONFLICT target
+NO_CONFLICT_TARGET = "42P10"
+# Table or view not deployed: PostgREST's schema-cache miss, or Postgres itself
+MISSING_RELATION = ("PGRST205", "42P01")
+
 
 def get_supabase() -> Client:
     """Retorna el cliente Supabase (singleton) configurado para schema btc_hub."""
     global _client
     if _client is None:
-        if not settings.supabase_url or not settings.supabase_key:
-            raise RuntimeError(
-                "Faltan SUPABASE_URL y/o SUPABASE_KEY en .env. "
-                "Check the .env file in the project root."
-            )
-        _client = create_client(
-            settings.supabase_url,
-            settings.supabase_key,
-            options=SyncClientOptions(schema=SCHEMA),
-        )
+        with _client_lock:
+            if _client is None:
+                if not settings.supabase_url or not settings.supabase_key:
+                    raise RuntimeError(
+                        "Faltan SUPABASE_URL y/o SUPABASE_KEY en .env. "
+                        "Check the .env file in the project root."
+                    )
+                _client = create_client(
+                    settings.supabase_url,
+                    settings.supabase_key,
+                    options=SyncClientOptions(
+                        schema=SCHEMA,
+                        httpx_client=httpx.Client(
+                            http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT,
+                        ),
+                    ),
+                )
     return _client
+
+
+def call_rpc(db, fn: str, params: dict | None = None):
+    """Call a Postgres function and return its data, or None if it is not deployed.
+
+    Used for optional server-side shortcuts: callers keep a table-query
+    fallback for databases where the function's migration is not applied.
+    Any other error (network, auth, bad parameters) is raised.
+    """
+    try:
+        return db.rpc(fn, params or {}).execute().data
+    except APIError as e:
+        if e.code in _MISSING_FUNCTION:
+            return None
+        raise
+
+
+def latest_dates(db, table: str, key_col: str, keys: list[str]) -> dict[str, date]:
+    """Last stored date per key of a (date, key) table; keys without rows are omitted.
+
+    One latest_dates RPC call when deployed (migration 017), otherwise one
+    limit-1 query per key.
+    """
+    rows = call_rpc(db, "latest_dates", {"tbl": table, "keys": keys})
+    if rows is not None:
+        return {r["key"]: date.fromisoformat(r["date"]) for r in rows if r["date"]}
+
+    latest = {}
+    for key in keys:
+        result = (
+            db.table(table)
+            .select("date")
+            .eq(key_col, key)
+            .order("date", desc=True)
+            .limit(1)
+            .execute()
+        )
+        if result.data:
+            latest[key] = date.fromisoformat(result.data[0]["date"])
+    return latest
@@ -1,12 +1,24 @@
 """FastAPI app — sirve datos del dashboard."""
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+try:
+    import orjson  # noqa: F401
+    _response_class = ORJSONResponse
+except ImportError:  # optional: pip install -e ".[fast]"
+    _response_class = JSONResponse
+
+# Dashboard data changes at most a few times a day; let browsers and
+# proxies reuse /api responses for a minute between polls
+API_CACHE_SECONDS = 60
 
 app = FastAPI(
     title="BTC Intelligence Hub",
     description="API para el centro de inteligencia Bitcoin",
     version="0.1.0",
+    default_response_class=_response_class,
 )
 
 app.add_middleware(
@@ -18,6 +30,19 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def api_cache_headers(request: Request, call_next):
+    """Mark successful /api GET responses as cacheable for API_CACHE_SECONDS."""
+    response = await call_next(request)
+    if (
+        request.method == "GET"
+        and request.url.path.startswith("/api/")
+        and response.status_code == 200
+    ):
+        response.headers.setdefault("Cache-Control", f"public, max-age={API_CACHE_SECONDS}")
+    return response
+
+
 @app.get("/health")
 def health():
     """Health check."""
@@ -37,29 +37,8 @@ def generate_ai_report():
 
     # Call Claude Sonnet
     try:
-        with httpx.Client(timeout=60) as client:
-            resp = client.post(
-                "https://api.anthropic.com/v1/messages",
-                headers={
-                    "x-api-key": settings.anthropic_api_key,
-                    "anthropic-version": "2023-06-01",
-                    "content-type": "application/json",
-                },
-                json={
-                    "model": "claude-sonnet-4-5-20250929",
-                    "max_tokens": 2048,
-                    "system": SYSTEM_PROMPT,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": f"Generate today's BTC Intelligence Report based on this data:\n\n{context}",
-                        }
-                    ],
-                },
-            )
-            resp.raise_for_status()
-            result = resp.json()
-            report_content = result["content"][0]["text"]
+        result = _request_report(context)
+        report_content = result["content"][0]["text"]
     except Exception as e:
         console.print(f"[red]Error calling Claude API: {e}[/red]")
         return
@@ -92,3 +71,33 @@ def generate_ai_report():
     cost = (input_tokens * 3 / 1_000_000) + (output_tokens * 15 / 1_000_000)
     console.print(f"[dim]Tokens: {input_tokens} in / {output_tokens} out ≈ ${cost:.4f}[/dim]")
     console.print(f"\n{report_content}")
+
+
+def _request_report(context: str) -> dict:
+    """POST the briefing to the Messages API.
+
+    Synchronous on purpose: generate_ai_report is also called from code that
+    already runs an event loop, where asyncio.run() would raise.
+    """
+    with httpx.Client(timeout=60) as client:
+        resp = client.post(
+            "https://api.anthropic.com/v1/messages",
+            headers={
+                "x-api-key": settings.anthropic_api_key,
+                "anthropic-version": "2023-06-01",
+                "content-type": "application/json",
+            },
+            json={
+                "model": "claude-sonnet-4-5-20250929",
+                "max_tokens": 2048,
+                "system": SYSTEM_PROMPT,
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": f"Generate today's BTC Intelligence Report based on this data:\n\n{context}",
+                    }
+                ],
+            },
+        )
+        resp.raise_for_status()
+        return resp.json()
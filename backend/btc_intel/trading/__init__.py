@@ -3,7 +3,7 @@
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class SwingPoint:
     price: float
     type: str  # "high" or "low"
@@ -12,7 +12,7 @@ class SwingPoint:
     percent_move: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class PriceLevel:
     price: float
     type: str  # "support" or "resistance"
@@ -31,7 +31,7 @@ class PriceLevel:
     last_touch_days: int = 999
 
 
-@dataclass
+@dataclass(slots=True)
 class Zone:
     price_low: float
     price_high: float
@@ -45,7 +45,7 @@ class Zone:
     has_gran_nivel: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class Setup:
     type: str  # "pullback", "breakout", "reversal"
     direction: str  # "LONG", "SHORT"
@@ -54,7 +54,7 @@ class Setup:
     reliability: str = "medium"  # "high", "medium", "low"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CandlePattern:
     pattern: str
     direction: str  # "LONG", "SHORT", "NEUTRAL"
@@ -62,7 +62,7 @@ class CandlePattern:
     candles: int  # number of candles in pattern
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtendedSignal:
     """Full signal with all v2 data."""
     timeframe: str
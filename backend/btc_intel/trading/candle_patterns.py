@@ -7,7 +7,12 @@ the most recent candles in a price DataFrame and returns structured
 
 from __future__ import annotations
 
+from collections import deque
+from collections.abc import Sequence
+
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 from btc_intel.trading import CandlePattern
 
@@ -32,9 +37,67 @@ PATTERNS: dict[str, tuple[str, int, int]] = {
     "doji": ("NEUTRAL", 3, 1),
 }
 
+# One shared (frozen) CandlePattern per catalogue entry
+_TEMPLATES: dict[str, CandlePattern] = {
+    pattern_id: CandlePattern(
+        pattern=pattern_id, direction=direction, strength=strength, candles=candles,
+    )
+    for pattern_id, (direction, strength, candles) in PATTERNS.items()
+}
+
+
+# Column order of the OHLC rows handed to the detectors
+OHLC = ["open", "high", "low", "close"]
+
+
+# ── Wick-ratio rules ────────────────────────────────────────────────────────
+# Shared by the public detectors and detect_all, which measures the current
+# candle once with _shape and feeds the result to every rule.
+
+def _shape(o: float, h: float, l: float, c: float) -> tuple[float, float, float]:
+    """(body, upper_wick, lower_wick) of a candle; a zero body counts as 0.01."""
+    body = abs(c - o)
+    if body == 0:
+        body = 0.01  # avoid division by zero
+    return body, h - max(o, c), min(o, c) - l
+
+
+def _is_hammer(body: float, upper_wick: float, lower_wick: float) -> bool:
+    return lower_wick >= 2 * body and upper_wick <= 0.3 * body
+
+
+def _is_shooting_star(body: float, upper_wick: float, lower_wick: float) -> bool:
+    return upper_wick >= 2 * body and lower_wick <= 0.3 * body
+
+
+def _is_pin_bar(body: float, upper_wick: float, lower_wick: float, direction: str) -> bool:
+    if direction == "LONG":
+        return lower_wick >= 2 * body and upper_wick <= 0.5 * body
+    else:  # SHORT
+        return upper_wick >= 2 * body and lower_wick <= 0.5 * body
+
+
+def _engulfs(prev: Sequence[float], curr: Sequence[float]) -> bool:
+    """Whether the body of ``curr`` strictly contains the body of ``prev``."""
+    prev_open, _, _, prev_close = prev
+    curr_open, _, _, curr_close = curr
+    if curr_close > curr_open:
+        curr_top, curr_bot = curr_close, curr_open
+    else:
+        curr_top, curr_bot = curr_open, curr_close
+    if prev_close > prev_open:
+        return curr_top > prev_close and curr_bot < prev_open
+    return curr_top > prev_open and curr_bot < prev_close
+
 
 class CandlePatternDetector:
-    """Detect candlestick patterns from OHLCV data."""
+    """Detect candlestick patterns from OHLCV data.
+
+    Detectors take plain floats: a single candle as ``o, h, l, c`` and
+    multi-candle patterns as ``(o, h, l, c)`` rows, oldest first. Any row
+    sequence works, including an ``ohlc[-3:]`` slice of an (N, 4) array,
+    though lists of Python floats are the fastest to unpack.
+    """
 
     # ------------------------------------------------------------------
     # Public API
@@ -58,62 +121,161 @@ class CandlePatternDetector:
         if len(prices_df) < 5:
             return []
 
-        df = prices_df.tail(5).reset_index(drop=True)
+        # Slice each column's array (a view, no DataFrame copy) and convert
+        # the five rows to Python floats once; detectors never touch pandas
+        rows = list(zip(*(
+            prices_df[col].to_numpy(dtype=np.float64)[-5:].tolist() for col in OHLC
+        )))
+        return self._detect_rows(rows)
+
+    def detect_all_np(self, ohlc: np.ndarray, timeframe: str) -> list[CandlePattern]:
+        """``detect_all`` for an (N, 4) array of open/high/low/close rows.
+
+        For callers that already hold the history as an array: no pandas
+        objects are built. Rows must be sorted by date ascending.
+        """
+        if len(ohlc) < 5:
+            return []
+        return self._detect_rows(np.asarray(ohlc, dtype=np.float64)[-5:].tolist())
+
+    def _detect_rows(self, rows: Sequence[Sequence[float]]) -> list[CandlePattern]:
+        """Run every detector on the last five (o, h, l, c) rows, oldest first."""
         found: list[CandlePattern] = []
 
         # Most recent candle
-        curr = df.iloc[-1]
-        prev = df.iloc[-2]
-        last3 = [df.iloc[-3], df.iloc[-2], df.iloc[-1]]
+        curr = rows[-1]
+        prev = rows[-2]
+        last3 = rows[-3:]
+        o, h, l, c = curr
 
         # --- Single-candle patterns (on current candle) ---
-        if self.detect_hammer(curr):
+        # Body and wicks are measured once and shared by the wick-ratio rules
+        shape = _shape(o, h, l, c)
+
+        if _is_hammer(*shape):
             found.append(self._make("hammer"))
 
-        if self.detect_shooting_star(curr):
+        shooting_star = _is_shooting_star(*shape)
+        if shooting_star:
             found.append(self._make("shooting_star"))
 
-        if self.detect_doji(curr):
+        if self.detect_doji(o, h, l, c):
             found.append(self._make("doji"))
 
-        if self.detect_pin_bar(curr, "LONG"):
+        if _is_pin_bar(*shape, "LONG"):
             found.append(self._make("bullish_pin_bar"))
 
-        if self.detect_pin_bar(curr, "SHORT"):
+        if _is_pin_bar(*shape, "SHORT"):
             found.append(self._make("bearish_pin_bar"))
 
         # Inverted hammer: same shape as shooting star but after a downtrend.
-        if self._is_downtrend(df) and self.detect_shooting_star(curr):
+        if shooting_star and self._is_downtrend(rows):
             found.append(self._make("inverted_hammer"))
 
-        # --- Two-candle patterns ---
-        if self.detect_engulfing(prev, curr, "LONG"):
-            found.append(self._make("bullish_engulfing"))
+        # --- Two- and three-candle patterns ---
+        # Bullish ones all end on a green candle and bearish ones on a red
+        # candle, so only one side needs checking (neither on a flat close).
+        # The body comparison is shared; each side only adds the prior colour.
+        engulfs = c != o and _engulfs(prev, curr)
+        if c > o:
+            if engulfs and prev[3] < prev[0]:
+                found.append(self._make("bullish_engulfing"))
 
-        if self.detect_engulfing(prev, curr, "SHORT"):
-            found.append(self._make("bearish_engulfing"))
+            if self.detect_morning_star(last3):
+                found.append(self._make("morning_star"))
 
-        # --- Three-candle patterns ---
-        if self.detect_morning_star(last3):
-            found.append(self._make("morning_star"))
+            if self.detect_three_soldiers(last3):
+                found.append(self._make("three_white_soldiers"))
 
-        if self.detect_evening_star(last3):
-            found.append(self._make("evening_star"))
+        elif c < o:
+            if engulfs and prev[3] > prev[0]:
+                found.append(self._make("bearish_engulfing"))
 
-        if self.detect_three_soldiers(last3):
-            found.append(self._make("three_white_soldiers"))
+            if self.detect_evening_star(last3):
+                found.append(self._make("evening_star"))
 
-        if self.detect_three_crows(last3):
-            found.append(self._make("three_black_crows"))
+            if self.detect_three_crows(last3):
+                found.append(self._make("three_black_crows"))
 
         return found
 
+    def detect_all_batch(self, prices_df: pd.DataFrame) -> dict[str, np.ndarray]:
+        """Vectorized ``detect_all`` for every bar of a history at once.
+
+        Returns one boolean mask per catalogue pattern, aligned with the rows
+        of ``prices_df``: ``masks[p][i]`` is True when ``detect_all`` on the
+        first ``i + 1`` rows would report ``p``. The first four rows are
+        always False, as ``detect_all`` needs five candles.
+        """
+        n = len(prices_df)
+        if n < 5:
+            return {pattern: np.zeros(n, dtype=bool) for pattern in PATTERNS}
+
+        o, h, l, c = (prices_df[col].to_numpy(dtype=np.float64) for col in OHLC)
+
+        body = np.abs(c - o)
+        body_nz = np.where(body == 0, 0.01, body)
+        # Body edges are computed once and shared by the wick and engulfing tests
+        body_top, body_bot = np.maximum(o, c), np.minimum(o, c)
+        upper = h - body_top
+        lower = body_bot - l
+        total_range = h - l
+        green, red = c > o, c < o
+
+        def prev(a: np.ndarray, k: int) -> np.ndarray:
+            """``a`` shifted k bars forward (value of k bars ago); head is padding."""
+            out = np.empty_like(a)
+            out[k:] = a[:n - k]
+            out[:k] = a[:k]
+            return out
+
+        shooting_star = (upper >= 2 * body_nz) & (lower <= 0.3 * body_nz)
+
+        # _is_downtrend over every five-bar window (a strided view, no copy)
+        windows = sliding_window_view(c, 5)
+        downtrend = np.zeros(n, dtype=bool)
+        downtrend[4:] = windows[:, 0] > windows[:, -1]
+
+        # Two candles: previous body vs current body
+        o1, c1, body1 = prev(o, 1), prev(c, 1), prev(body, 1)
+        engulfs = (body_top > prev(body_top, 1)) & (body_bot < prev(body_bot, 1))
+
+        # Three candles: first (2 bars ago), middle (1 bar ago), current
+        o2, c2, body2 = prev(o, 2), prev(c, 2), prev(body, 2)
+        mid2, mid1 = (o2 + c2) / 2, (o1 + c1) / 2
+        small_middle = (body2 != 0) & (body1 < body2 * 0.5)
+        green2, red2 = prev(green, 2), prev(red, 2)
+
+        # Soldiers / crows: a green (red) bar two bars ago, then two bars that
+        # are each green (red) and close above (below) the bar before
+        step = np.zeros(n)
+        step[1:] = np.diff(c)
+        up, down = green & (step > 0), red & (step < 0)
+
+        masks = {
+            "hammer": (lower >= 2 * body_nz) & (upper <= 0.3 * body_nz),
+            "shooting_star": shooting_star,
+            "doji": (total_range != 0) & (body < 0.10 * total_range),
+            "bullish_pin_bar": (lower >= 2 * body_nz) & (upper <= 0.5 * body_nz),
+            "bearish_pin_bar": (upper >= 2 * body_nz) & (lower <= 0.5 * body_nz),
+            "inverted_hammer": downtrend & shooting_star,
+            "bullish_engulfing": prev(red, 1) & green & engulfs,
+            "bearish_engulfing": prev(green, 1) & red & engulfs,
+            "morning_star": red2 & green & small_middle & (mid1 < c2) & (c > mid2),
+            "evening_star": green2 & red & small_middle & (mid1 > c2) & (c < mid2),
+            "three_white_soldiers": green2 & prev(up, 1) & up,
+            "three_black_crows": red2 & prev(down, 1) & down,
+        }
+        for mask in masks.values():
+            mask[:4] = False
+        return masks
+
     # ------------------------------------------------------------------
     # Detection methods
     # ------------------------------------------------------------------
 
     @staticmethod
-    def detect_pin_bar(candle: pd.Series, direction: str) -> bool:
+    def detect_pin_bar(o: float, h: float, l: float, c: float, direction: str) -> bool:
         """Detect a pin bar.
 
         A bullish pin bar (direction="LONG") has a long lower wick >= 2x the
@@ -122,22 +284,12 @@ class CandlePatternDetector:
         A bearish pin bar (direction="SHORT") has a long upper wick >= 2x the
         body and a short lower wick <= 0.5x the body.
         """
-        body = abs(candle["close"] - candle["open"])
-        if body == 0:
-            body = 0.01  # avoid division by zero
-
-        upper_wick = candle["high"] - max(candle["open"], candle["close"])
-        lower_wick = min(candle["open"], candle["close"]) - candle["low"]
-
-        if direction == "LONG":
-            return lower_wick >= 2 * body and upper_wick <= 0.5 * body
-        else:  # SHORT
-            return upper_wick >= 2 * body and lower_wick <= 0.5 * body
+        return _is_pin_bar(*_shape(o, h, l, c), direction)
 
     @staticmethod
     def detect_engulfing(
-        prev: pd.Series,
-        curr: pd.Series,
+        prev: Sequence[float],
+        curr: Sequence[float],
         direction: str,
     ) -> bool:
         """Detect an engulfing pattern.
@@ -147,143 +299,110 @@ class CandlePatternDetector:
 
         Bearish engulfing (direction="SHORT"): opposite.
         """
-        prev_open, prev_close = prev["open"], prev["close"]
-        curr_open, curr_close = curr["open"], curr["close"]
-
-        prev_body_top = max(prev_open, prev_close)
-        prev_body_bot = min(prev_open, prev_close)
-        curr_body_top = max(curr_open, curr_close)
-        curr_body_bot = min(curr_open, curr_close)
-
+        prev_open, _, _, prev_close = prev
+        curr_open, _, _, curr_close = curr
         if direction == "LONG":
-            prev_is_red = prev_close < prev_open
-            curr_is_green = curr_close > curr_open
-            engulfs = curr_body_top > prev_body_top and curr_body_bot < prev_body_bot
-            return prev_is_red and curr_is_green and engulfs
+            colours = prev_close < prev_open and curr_close > curr_open
         else:  # SHORT
-            prev_is_green = prev_close > prev_open
-            curr_is_red = curr_close < curr_open
-            engulfs = curr_body_top > prev_body_top and curr_body_bot < prev_body_bot
-            return prev_is_green and curr_is_red and engulfs
+            colours = prev_close > prev_open and curr_close < curr_open
+        return colours and _engulfs(prev, curr)
 
     @staticmethod
-    def detect_hammer(candle: pd.Series) -> bool:
+    def detect_hammer(o: float, h: float, l: float, c: float) -> bool:
         """Detect a hammer: small body at top, long lower wick >= 2x body,
         upper wick <= 0.3x body."""
-        body = abs(candle["close"] - candle["open"])
-        if body == 0:
-            body = 0.01
-
-        upper_wick = candle["high"] - max(candle["open"], candle["close"])
-        lower_wick = min(candle["open"], candle["close"]) - candle["low"]
-
-        return lower_wick >= 2 * body and upper_wick <= 0.3 * body
+        return _is_hammer(*_shape(o, h, l, c))
 
     @staticmethod
-    def detect_shooting_star(candle: pd.Series) -> bool:
+    def detect_shooting_star(o: float, h: float, l: float, c: float) -> bool:
         """Detect a shooting star: small body at bottom, long upper wick >= 2x
         body, lower wick <= 0.3x body."""
-        body = abs(candle["close"] - candle["open"])
-        if body == 0:
-            body = 0.01
-
-        upper_wick = candle["high"] - max(candle["open"], candle["close"])
-        lower_wick = min(candle["open"], candle["close"]) - candle["low"]
-
-        return upper_wick >= 2 * body and lower_wick <= 0.3 * body
+        return _is_shooting_star(*_shape(o, h, l, c))
 
     @staticmethod
-    def detect_doji(candle: pd.Series) -> bool:
+    def detect_doji(o: float, h: float, l: float, c: float) -> bool:
         """Detect a doji: body < 10 % of the total candle range."""
-        total_range = candle["high"] - candle["low"]
+        total_range = h - l
         if total_range == 0:
             return False
 
-        body = abs(candle["close"] - candle["open"])
+        body = abs(c - o)
         return body < 0.10 * total_range
 
     @staticmethod
-    def detect_morning_star(candles: list[pd.Series]) -> bool:
+    def detect_morning_star(candles: Sequence[Sequence[float]]) -> bool:
         """Detect a morning star (3 candles).
 
         1. Big red candle.
         2. Small-body candle (gap down — body midpoint below candle 1 close).
         3. Big green candle that closes above the midpoint of candle 1's body.
         """
-        c1, c2, c3 = candles
+        (o1, _, _, c1), (o2, _, _, c2), (o3, _, _, c3) = candles
 
-        c1_body = abs(c1["close"] - c1["open"])
-        c2_body = abs(c2["close"] - c2["open"])
-        c3_body = abs(c3["close"] - c3["open"])
+        c1_body = abs(c1 - o1)
+        c2_body = abs(c2 - o2)
 
         if c1_body == 0:
             return False
 
-        c1_is_red = c1["close"] < c1["open"]
-        c3_is_green = c3["close"] > c3["open"]
+        c1_is_red = c1 < o1
+        c3_is_green = c3 > o3
 
         # Small body for middle candle (less than half of first candle body).
         small_middle = c2_body < c1_body * 0.5
 
         # Gap down: middle candle body midpoint is below first candle close.
-        c2_mid = (c2["open"] + c2["close"]) / 2
-        gap_down = c2_mid < c1["close"]
+        c2_mid = (o2 + c2) / 2
+        gap_down = c2_mid < c1
 
         # Third candle closes above midpoint of first candle body.
-        c1_mid = (c1["open"] + c1["close"]) / 2
-        strong_close = c3["close"] > c1_mid
+        c1_mid = (o1 + c1) / 2
+        strong_close = c3 > c1_mid
 
         return c1_is_red and c3_is_green and small_middle and gap_down and strong_close
 
     @staticmethod
-    def detect_evening_star(candles: list[pd.Series]) -> bool:
+    def detect_evening_star(candles: Sequence[Sequence[float]]) -> bool:
         """Detect an evening star (3 candles) — mirror of morning star.
 
         1. Big green candle.
         2. Small-body candle (gap up — body midpoint above candle 1 close).
         3. Big red candle that closes below the midpoint of candle 1's body.
         """
-        c1, c2, c3 = candles
+        (o1, _, _, c1), (o2, _, _, c2), (o3, _, _, c3) = candles
 
-        c1_body = abs(c1["close"] - c1["open"])
-        c2_body = abs(c2["close"] - c2["open"])
-        c3_body = abs(c3["close"] - c3["open"])
+        c1_body = abs(c1 - o1)
+        c2_body = abs(c2 - o2)
 
         if c1_body == 0:
             return False
 
-        c1_is_green = c1["close"] > c1["open"]
-        c3_is_red = c3["close"] < c3["open"]
+        c1_is_green = c1 > o1
+        c3_is_red = c3 < o3
 
         small_middle = c2_body < c1_body * 0.5
 
-        c2_mid = (c2["open"] + c2["close"]) / 2
-        gap_up = c2_mid > c1["close"]
+        c2_mid = (o2 + c2) / 2
+        gap_up = c2_mid > c1
 
-        c1_mid = (c1["open"] + c1["close"]) / 2
-        strong_close = c3["close"] < c1_mid
+        c1_mid = (o1 + c1) / 2
+        strong_close = c3 < c1_mid
 
         return c1_is_green and c3_is_red and small_middle and gap_up and strong_close
 
     @staticmethod
-    def detect_three_soldiers(candles: list[pd.Series]) -> bool:
+    def detect_three_soldiers(candles: Sequence[Sequence[float]]) -> bool:
         """Detect three white soldiers: 3 consecutive green candles with
         progressively higher closes."""
-        for c in candles:
-            if c["close"] <= c["open"]:
-                return False
-
-        return candles[1]["close"] > candles[0]["close"] and candles[2]["close"] > candles[1]["close"]
+        (o1, _, _, c1), (o2, _, _, c2), (o3, _, _, c3) = candles
+        return c1 > o1 and c2 > o2 and c3 > o3 and c1 < c2 < c3
 
     @staticmethod
-    def detect_three_crows(candles: list[pd.Series]) -> bool:
+    def detect_three_crows(candles: Sequence[Sequence[float]]) -> bool:
         """Detect three black crows: 3 consecutive red candles with
         progressively lower closes."""
-        for c in candles:
-            if c["close"] >= c["open"]:
-                return False
-
-        return candles[1]["close"] < candles[0]["close"] and candles[2]["close"] < candles[1]["close"]
+        (o1, _, _, c1), (o2, _, _, c2), (o3, _, _, c3) = candles
+        return c1 < o1 and c2 < o2 and c3 < o3 and c1 > c2 > c3
 
     # ------------------------------------------------------------------
     # Helpers
@@ -291,18 +410,33 @@ class CandlePatternDetector:
 
     @staticmethod
     def _make(pattern_id: str) -> CandlePattern:
-        """Build a ``CandlePattern`` from the catalogue entry."""
-        direction, strength, candles = PATTERNS[pattern_id]
-        return CandlePattern(
-            pattern=pattern_id,
-            direction=direction,
-            strength=strength,
-            candles=candles,
-        )
+        """The ``CandlePattern`` of a catalogue entry (a shared frozen instance)."""
+        return _TEMPLATES[pattern_id]
 
     @staticmethod
-    def _is_downtrend(df: pd.DataFrame) -> bool:
-        """Simple heuristic: the close 4 bars ago is higher than current close."""
-        if len(df) < 5:
-            return False
-        return df.iloc[0]["close"] > df.iloc[-1]["close"]
+    def _is_downtrend(rows: Sequence[Sequence[float]]) -> bool:
+        """Simple heuristic: the close 4 bars ago is higher than current close.
+
+        ``rows`` is the five-candle window; callers guarantee its length.
+        """
+        return rows[0][3] > rows[-1][3]
+
+
+class StreamingCandleDetector(CandlePatternDetector):
+    """Incremental ``detect_all`` for live feeds: push one closed candle per bar.
+
+    Keeps the last five candles as float rows, so each ``update`` costs the
+    same few detector checks as ``detect_all_np`` without rebuilding a
+    window from the full history.
+    """
+
+    def __init__(self) -> None:
+        self._rows: deque[tuple[float, float, float, float]] = deque(maxlen=5)
+
+    def update(self, o: float, h: float, l: float, c: float) -> list[CandlePattern]:
+        """Append the newest candle and return the patterns it completes."""
+        self._rows.append((float(o), float(h), float(l), float(c)))
+        if len(self._rows) < 5:
+            return []
+        return self._detect_rows(list(self._rows))
+
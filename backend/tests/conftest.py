@@ -11,6 +11,7 @@ from __future__ import annotations
 from unittest.mock import MagicMock, patch
 
 import pytest
+from postgrest.exceptions import APIError
 
 
 # ---------------------------------------------------------------------------
@@ -20,7 +21,7 @@ import pytest
 class MockQueryBuilder:
     """Simulates the Supabase chained query API (.select().eq().order()...).
 
-    Supports basic eq/neq filtering against the in-memory data so that
+    Supports basic eq/neq/in filtering against the in-memory data so that
     queries like .eq("indicator", "RSI_14") only return matching rows.
     """
 
@@ -28,12 +29,14 @@ class MockQueryBuilder:
         self._data = list(data) if data is not None else []
         self._filters_eq: list[tuple[str, object]] = []
         self._filters_neq: list[tuple[str, object]] = []
+        self._filters_in: list[tuple[str, list]] = []
 
     def _clone(self) -> "MockQueryBuilder":
         """Return a shallow copy that shares the same data list."""
         c = MockQueryBuilder(self._data)
         c._filters_eq = list(self._filters_eq)
         c._filters_neq = list(self._filters_neq)
+        c._filters_in = list(self._filters_in)
         return c
 
     # -- chaining methods that just return self --
@@ -51,6 +54,11 @@ class MockQueryBuilder:
         c._filters_neq.append((field, value))
         return c
 
+    def in_(self, field, values):
+        c = self._clone()
+        c._filters_in.append((field, list(values)))
+        return c
+
     def gte(self, *_a, **_kw):
         return self
 
@@ -99,6 +107,8 @@ class MockQueryBuilder:
             result = [r for r in result if r.get(field) == value]
         for field, value in self._filters_neq:
             result = [r for r in result if r.get(field) != value]
+        for field, values in self._filters_in:
+            result = [r for r in result if r.get(field) in values]
         return result
 
     def execute(self):
@@ -119,18 +129,41 @@ class MockSupabaseClient:
 
     def __init__(self):
         self._tables: dict[str, list[dict]] = {}
+        self._rpcs: dict[str, object] = {}
 
     def set_table_data(self, table_name: str, data: list[dict]):
         self._tables[table_name] = data
 
+    def set_rpc_result(self, fn: str, data):
+        """Register a Postgres function; unregistered ones raise like PostgREST."""
+        self._rpcs[fn] = data
+
     def table(self, name: str) -> MockQueryBuilder:
         return MockQueryBuilder(self._tables.get(name, []))
 
+    def rpc(self, fn: str, params: dict | None = None):
+        if fn not in self._rpcs:
+            raise APIError({"code": "PGRST202", "message": f"Could not find the function {fn}"})
+        resp = MagicMock()
+        resp.execute.return_value.data = self._rpcs[fn]
+        return resp
+
 
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(autouse=True)
+def _reset_analysis_cache():
+    """Memoized analyses and cached renders must not leak between tests."""
+    from btc_intel.context.cache import bump_version
+    from btc_intel.context.formatters import invalidate_analyses
+
+    invalidate_analyses()
+    bump_version()
+    yield
+
+
 @pytest.fixture
 def mock_db():
     """Returns a MockSupabaseClient instance pre-loaded with sensible defaults."""
@@ -188,6 +221,8 @@ def mock_db():
             "created_at": "2026-02-06T10:00:00",
         },
     ])
+    # The view serves the same rows with content trimmed to 150 chars
+    client.set_table_data("conclusions_preview", client._tables["conclusions"])
 
     return client
 
@@ -0,0 +1,169 @@
+"""Tests for CandlePatternDetector — single, two and three candle patterns."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from btc_intel.trading.candle_patterns import (
+    PATTERNS,
+    CandlePatternDetector,
+    StreamingCandleDetector,
+)
+
+detector = CandlePatternDetector()
+
+
+def _frame(candles: list[tuple[float, float, float, float]]) -> pd.DataFrame:
+    """OHLC frame from (open, high, low, close) tuples, oldest first."""
+    return pd.DataFrame(
+        candles, columns=["open", "high", "low", "close"],
+    ).assign(date=pd.date_range("2026-01-01", periods=len(candles)))
+
+
+def _patterns(candles) -> list[str]:
+    return [p.pattern for p in detector.detect_all(_frame(candles), "1D")]
+
+
+# Neutral filler: mid-range body, nothing else fires on it
+_FLAT = (100.0, 104.0, 96.0, 101.0)
+
+
+class TestSingleCandle:
+    @pytest.mark.parametrize("ohlc,expected", [
+        ((100, 100.6, 90, 100.5), True),  # long lower wick, tiny upper
+        ((100, 106, 90, 101), False),     # upper wick too long
+        ((100, 101, 99, 100.5), False),   # lower wick too short
+    ])
+    def test_hammer(self, ohlc, expected):
+        assert detector.detect_hammer(*ohlc) is expected
+
+    def test_shooting_star(self):
+        assert detector.detect_shooting_star(100, 110, 99.9, 100.5)
+        assert not detector.detect_shooting_star(100, 101, 90, 100.5)
+
+    def test_doji(self):
+        assert detector.detect_doji(100, 105, 95, 100.5)
+        assert not detector.detect_doji(100, 105, 95, 104)
+        assert not detector.detect_doji(100, 100, 100, 100)  # zero range
+
+    def test_pin_bar_direction(self):
+        assert detector.detect_pin_bar(100, 100.2, 90, 100.5, "LONG")
+        assert not detector.detect_pin_bar(100, 100.2, 90, 100.5, "SHORT")
+        assert detector.detect_pin_bar(100, 110, 99.9, 100.5, "SHORT")
+
+    def test_zero_body_uses_floor(self):
+        # body 0 -> 0.01: a 1-point lower wick is far above 2x the floor
+        assert detector.detect_hammer(100, 100, 99, 100)
+
+
+class TestMultiCandle:
+    def test_engulfing(self):
+        red, green = (105, 106, 99, 100), (99, 108, 98, 107)
+        assert detector.detect_engulfing(red, green, "LONG")
+        assert not detector.detect_engulfing(red, green, "SHORT")
+        assert detector.detect_engulfing((100, 106, 99, 105), (106, 107, 98, 99), "SHORT")
+
+    def test_morning_and_evening_star(self):
+        morning = [(110, 111, 99, 100), (99, 100, 97, 98), (99, 109, 98, 108)]
+        evening = [(100, 111, 99, 110), (111, 113, 110, 112), (111, 112, 101, 102)]
+        assert detector.detect_morning_star(morning)
+        assert not detector.detect_evening_star(morning)
+        assert detector.detect_evening_star(evening)
+        assert not detector.detect_morning_star(evening)
+
+    def test_three_soldiers_and_crows(self):
+        soldiers = [(100, 103, 99, 102), (102, 105, 101, 104), (104, 107, 103, 106)]
+        crows = [(106, 107, 103, 104), (104, 105, 101, 102), (102, 103, 99, 100)]
+        assert detector.detect_three_soldiers(soldiers)
+        assert not detector.detect_three_crows(soldiers)
+        assert detector.detect_three_crows(crows)
+        # Closes must keep rising
+        assert not detector.detect_three_soldiers([soldiers[0], soldiers[2], soldiers[1]])
+
+    def test_accepts_array_slice(self):
+        ohlc = np.array([_FLAT, _FLAT, (110, 111, 99, 100), (99, 100, 97, 98), (99, 109, 98, 108)])
+        assert detector.detect_morning_star(ohlc[-3:])
+        assert not detector.detect_three_crows(ohlc[-3:])
+
+
+class TestDetectAll:
+    def test_needs_five_candles(self):
+        assert detector.detect_all(_frame([_FLAT] * 4), "1D") == []
+
+    def test_flat_market_detects_nothing(self):
+        assert _patterns([_FLAT] * 5) == []
+
+    def test_bullish_engulfing(self):
+        found = detector.detect_all(
+            _frame([_FLAT, _FLAT, _FLAT, (105, 106, 99, 100), (99, 108, 98, 107)]), "1D",
+        )
+        engulfing = [p for p in found if p.pattern == "bullish_engulfing"]
+        assert len(engulfing) == 1
+        assert (engulfing[0].direction, engulfing[0].strength, engulfing[0].candles) == ("LONG", 8, 2)
+
+    def test_patterns_are_shared_and_immutable(self):
+        candles = [_FLAT] * 3 + [(105, 106, 99, 100), (99, 108, 98, 107)]
+        first = detector.detect_all(_frame(candles), "1D")
+        second = detector.detect_all(_frame(candles), "1D")
+        assert first[0] is second[0]
+        with pytest.raises(AttributeError):
+            first[0].strength = 1
+
+    def test_inverted_hammer_needs_downtrend(self):
+        star = (100, 110, 99.9, 100.5)
+        assert "inverted_hammer" in _patterns([(120, 121, 119, 120)] + [_FLAT] * 3 + [star])
+        assert "inverted_hammer" not in _patterns([(90, 91, 89, 90)] + [_FLAT] * 3 + [star])
+        assert "shooting_star" in _patterns([(90, 91, 89, 90)] + [_FLAT] * 3 + [star])
+
+    def test_uses_last_five_rows_regardless_of_index(self):
+        candles = [_FLAT] * 3 + [(105, 106, 99, 100), (99, 108, 98, 107)]
+        df = _frame([(1, 2, 0.5, 1.5)] * 10 + candles)
+        df.index = df.index + 1000
+        assert "bullish_engulfing" in [p.pattern for p in detector.detect_all(df, "1D")]
+
+    def test_array_input_matches_frame(self):
+        candles = [_FLAT] * 3 + [(105, 106, 99, 100), (99, 108, 98, 107)]
+        assert detector.detect_all_np(np.array(candles), "1D") == \
+            detector.detect_all(_frame(candles), "1D")
+        assert detector.detect_all_np(np.array(candles[:4]), "1D") == []
+
+
+class TestDetectAllBatch:
+    @staticmethod
+    def _history(n: int = 120, seed: int = 7) -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
+        base = np.round(100 + rng.normal(0, 3, n).cumsum())  # rounding gives ties
+        o = base + rng.normal(0, 2, n)
+        c = base + rng.normal(0, 2, n)
+        return pd.DataFrame({
+            "open": o,
+            "high": np.maximum(o, c) + np.abs(rng.normal(0, 2, n)),
+            "low": np.minimum(o, c) - np.abs(rng.normal(0, 2, n)),
+            "close": c,
+        })
+
+    def test_matches_detect_all_on_every_prefix(self):
+        df = self._history()
+        masks = detector.detect_all_batch(df)
+        assert set(masks) == set(PATTERNS)
+        for i in range(len(df)):
+            expected = {p.pattern for p in detector.detect_all(df.iloc[:i + 1], "1D")}
+            assert {p for p, m in masks.items() if m[i]} == expected
+
+    def test_short_history_is_all_false(self):
+        masks = detector.detect_all_batch(self._history(n=3))
+        assert all(len(m) == 3 and not m.any() for m in masks.values())
+
+
+class TestStreamingCandleDetector:
+    def test_matches_batch_bar_by_bar(self):
+        df = TestDetectAllBatch._history(n=60, seed=11)
+        masks = detector.detect_all_batch(df)
+        stream = StreamingCandleDetector()
+        for i, row in enumerate(df[["open", "high", "low", "close"]].itertuples(index=False)):
+            found = {p.pattern for p in stream.update(*row)}
+            assert found == {p for p, m in masks.items() if m[i]}
+
+    def test_silent_until_five_candles(self):
+        stream = StreamingCandleDetector()
+        assert [stream.update(*_FLAT) for _ in range(4)] == [[], [], [], []]
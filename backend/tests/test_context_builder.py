@@ -260,3 +260,66 @@ class TestBuildContextUnknownScope:
             result = build_context(scope="nonexistent")
 
         assert "desconocido" in result.lower() or "nonexistent" in result.lower()
+
+
+class TestBuildContextCache:
+    """Repeated renders of the same scope reuse the first one until new data lands."""
+
+    def test_repeat_render_served_from_cache(self):
+        from btc_intel.context.builder import build_context
+        with patch("btc_intel.context.builder.get_supabase", return_value=MagicMock()), \
+                patch("btc_intel.context.builder._build_morning", return_value="X") as build:
+            assert build_context(scope="morning") == "X"
+            assert build_context(scope="morning") == "X"
+        assert build.call_count == 1
+
+    def test_bump_version_invalidates(self):
+        from btc_intel.context.builder import build_context
+        from btc_intel.context.cache import bump_version
+        with patch("btc_intel.context.builder.get_supabase", return_value=MagicMock()), \
+                patch("btc_intel.context.builder._build_morning", return_value="X") as build:
+            build_context(scope="morning")
+            bump_version()
+            build_context(scope="morning")
+        assert build.call_count == 2
+
+    def test_expired_entries_evicted_on_insert(self):
+        from btc_intel.context import cache
+
+        @cache.ttl_cache(0)
+        def render(db, n):
+            return n
+
+        render(None, 1)
+        render(None, 2)
+        assert [k[3] for k in cache._CACHE if k[1] == "render"] == [(2,)]
+
+    def test_concurrent_renders_and_bumps(self):
+        import sys
+        from concurrent.futures import ThreadPoolExecutor
+
+        from btc_intel.context import cache
+
+        @cache.ttl_cache(0)
+        def render(db, n):
+            return n
+
+        @cache.ttl_cache(3600)
+        def keep(db, n):
+            return n
+
+        def hammer(i):
+            for n in range(600):
+                keep(None, (i, n))  # live entries make every eviction scan long
+                assert render(None, (i, n)) == (i, n)
+                if n % 200 == 199:
+                    cache.bump_version()
+
+        # Switch threads often so a scan overlaps other inserts and clears
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(8) as pool:
+                list(pool.map(hammer, range(8)))
+        finally:
+            sys.setswitchinterval(interval)
@@ -0,0 +1,44 @@
+"""Tests for the shared Supabase helpers."""
+
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+from postgrest.exceptions import APIError
+
+from btc_intel.db import call_rpc, latest_dates
+from tests.conftest import MockSupabaseClient
+
+
+class TestLatestDates:
+    def test_uses_rpc_when_deployed(self):
+        db = MockSupabaseClient()
+        db.set_rpc_result("latest_dates", [
+            {"key": "SPX", "date": "2026-02-05"},
+            {"key": "GOLD", "date": None},
+        ])
+        assert latest_dates(db, "macro_data", "asset", ["SPX", "GOLD"]) == {
+            "SPX": date(2026, 2, 5),
+        }
+
+    def test_falls_back_to_one_query_per_key(self):
+        db = MockSupabaseClient()
+        db.set_table_data("macro_data", [
+            {"asset": "SPX", "date": "2026-02-05"},
+            {"asset": "DXY", "date": "2026-02-04"},
+        ])
+        assert latest_dates(db, "macro_data", "asset", ["SPX", "DXY", "GOLD"]) == {
+            "SPX": date(2026, 2, 5),
+            "DXY": date(2026, 2, 4),
+        }
+
+
+class TestCallRpc:
+    def test_missing_function_returns_none(self):
+        assert call_rpc(MockSupabaseClient(), "compare_snapshot") is None
+
+    def test_other_errors_raised(self):
+        db = MockSupabaseClient()
+        db.rpc = MagicMock(side_effect=APIError({"code": "42501", "message": "permission denied"}))
+        with pytest.raises(APIError):
+            call_rpc(db, "compare_snapshot")
@@ -0,0 +1,56 @@
+"""Tests for the loader disk cache."""
+
+import os
+import time
+
+import pytest
+
+from btc_intel.config import settings
+from btc_intel.data import disk_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "data_dir", tmp_path)
+    monkeypatch.setattr(settings, "cache_ttl_hours", 12)
+    return tmp_path
+
+
+class TestDiskCache:
+    def test_miss_returns_none(self):
+        assert disk_cache.load("blockchain", "https://example.com/a") is None
+
+    def test_round_trip(self):
+        disk_cache.store("blockchain", "https://example.com/a", b'{"values": []}')
+        assert disk_cache.load("blockchain", "https://example.com/a") == b'{"values": []}'
+
+    def test_keys_and_namespaces_are_separate(self):
+        disk_cache.store("blockchain", "k", b"1")
+        assert disk_cache.load("blockchain", "other") is None
+        assert disk_cache.load("yahoo", "k") is None
+
+    def test_expired_entry_ignored(self):
+        disk_cache.store("blockchain", "k", b"1")
+        path = disk_cache._path("blockchain", "k")
+        old = time.time() - 13 * 3600
+        os.utime(path, (old, old))
+        assert disk_cache.load("blockchain", "k") is None
+        assert not path.exists()
+
+    def test_store_sweeps_expired_entries(self):
+        disk_cache.store("yahoo", "old", b"1")
+        path = disk_cache._path("yahoo", "old")
+        old = time.time() - 13 * 3600
+        os.utime(path, (old, old))
+        disk_cache.store("yahoo", "new", b"2")
+        assert not path.exists()
+        assert disk_cache.load("yahoo", "new") == b"2"
+
+    def test_disabled_by_default(self):
+        assert type(settings).model_fields["cache_ttl_hours"].default == 0
+
+    def test_disabled_with_zero_ttl(self, monkeypatch, cache_dir):
+        monkeypatch.setattr(settings, "cache_ttl_hours", 0)
+        disk_cache.store("blockchain", "k", b"1")
+        assert disk_cache.load("blockchain", "k") is None
+        assert not (cache_dir / "cache").exists()
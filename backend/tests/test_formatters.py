@@ -0,0 +1,307 @@
+"""Tests for context formatters -- individual sections rendered from mock data."""
+
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from postgrest.exceptions import APIError
+
+from btc_intel.context.cache import bump_version
+from btc_intel.context.formatters import (
+    _FG_LABELS,
+    _today_strs,
+    format_compare_section,
+    format_conclusions_section,
+    format_cycle_score_section,
+    format_events_section,
+    format_macro_section,
+    format_price_section,
+    format_risk_section,
+    format_sentiment_section,
+    format_signal_changes,
+    format_technical_section,
+    invalidate_analyses,
+)
+from btc_intel.context.snapshot import ContextSnapshot, gather, load_snapshot
+
+_RISK_PATCH = "btc_intel.analysis.risk.analyze_risk"
+_RISK_RETURN = {"current_drawdown": -5, "volatility_30d": 3.2, "sharpe_365d": 1.5, "var_95": -8}
+
+
+class TestTodayStrs:
+    """_today_strs pins every relative date to a single as-of day."""
+
+    def test_explicit_as_of(self):
+        today, yesterday, week_ahead = _today_strs(date(2026, 3, 1))
+        assert today == "2026-03-01"
+        assert yesterday == "2026-02-28"
+        assert week_ahead == "2026-03-08"
+
+    def test_defaults_to_today(self):
+        today, _, _ = _today_strs()
+        assert today == str(date.today())
+
+
+class TestAsOfFormatters:
+    """Formatters that depend on the current date accept an as_of override."""
+
+    def test_signal_changes_accepts_as_of(self, mock_db):
+        result = format_signal_changes(mock_db, as_of=date(2026, 2, 6))
+        assert "Changes Since Yesterday" in result
+
+    def test_events_section_empty(self, mock_db):
+        mock_db.set_table_data("events", [])
+        assert format_events_section(mock_db, as_of=date(2026, 2, 6)) == ""
+
+    def test_events_section_lists_events(self, mock_db):
+        mock_db.set_table_data("events", [
+            {"date": "2026-02-10", "title": "FOMC", "category": "macro", "impact": "high"},
+        ])
+        result = format_events_section(mock_db, as_of=date(2026, 2, 6))
+        assert "FOMC" in result
+        assert "Upcoming Events" in result
+
+
+class TestAnalysisMemoization:
+    """Heavy analysis delegates run once per as-of day."""
+
+    def test_risk_computed_once_per_day(self, mock_db):
+        with patch(_RISK_PATCH, return_value=_RISK_RETURN) as mock_risk:
+            first = format_risk_section(mock_db, as_of=date(2026, 2, 6))
+            second = format_risk_section(mock_db, as_of=date(2026, 2, 6))
+
+        assert first == second
+        assert mock_risk.call_count == 1
+
+    def test_invalidate_forces_recompute(self, mock_db):
+        with patch(_RISK_PATCH, return_value=_RISK_RETURN) as mock_risk:
+            format_risk_section(mock_db, as_of=date(2026, 2, 6))
+            invalidate_analyses()
+            format_risk_section(mock_db, as_of=date(2026, 2, 6))
+
+        assert mock_risk.call_count == 2
+
+    def test_errors_are_not_cached(self, mock_db):
+        with patch(_RISK_PATCH, side_effect=RuntimeError("db down")):
+            assert format_risk_section(mock_db, as_of=date(2026, 2, 6)) == ""
+        with patch(_RISK_PATCH, return_value=_RISK_RETURN):
+            assert "VaR 95%: -8%" in format_risk_section(mock_db, as_of=date(2026, 2, 6))
+
+
+class TestSnapshot:
+    """A prefetched snapshot renders the same sections as per-key queries."""
+
+    def test_latest_row_per_key(self, mock_db):
+        snapshot = load_snapshot(mock_db)
+        assert snapshot.tech["RSI_14"]["value"] == "55.3"
+        assert snapshot.sentiment["FEAR_GREED"]["value"] == "65"
+        assert snapshot.prices[0]["date"] == "2026-02-06"
+
+    def test_technical_matches_direct_queries(self, mock_db):
+        snapshot = load_snapshot(mock_db)
+        assert format_technical_section(mock_db, snapshot=snapshot) == format_technical_section(mock_db)
+
+    def test_technical_uses_latest_indicators_rpc(self, mock_db):
+        mock_db.set_rpc_result("latest_indicators", [
+            {"indicator": "RSI_14", "value": 71.0, "signal": "bearish", "date": "2026-02-06"},
+        ])
+        assert load_snapshot(mock_db).tech == {
+            "RSI_14": {"indicator": "RSI_14", "value": 71.0, "signal": "bearish", "date": "2026-02-06"},
+        }
+        assert "0 bullish, 1 bearish (RSI_14: bearish)" in format_technical_section(mock_db)
+
+    def test_briefing_rpc_fills_every_slice(self, mock_db):
+        mock_db.set_rpc_result("get_briefing_snapshot", {
+            "prices": [{"date": "2026-02-07", "close": 101000}],
+            "cycle": [{"date": "2026-02-07", "score": 70, "phase": "late_bull"}],
+            "tech": {"RSI_14": {"indicator": "RSI_14", "value": 60, "signal": "bullish"}},
+            "onchain": {},
+            "sentiment": {"FEAR_GREED": {"metric": "FEAR_GREED", "value": 80}},
+            "alerts": [],
+        })
+        snapshot = load_snapshot(mock_db)
+        assert snapshot.prices[0]["close"] == 101000
+        assert snapshot.onchain == {}
+        assert "Score: **70/100**" in format_cycle_score_section(mock_db, snapshot=snapshot)
+        assert "Fear & Greed: 80 (Greed)" in format_sentiment_section(mock_db, snapshot=snapshot)
+
+    def test_sentiment_matches_direct_queries(self, mock_db):
+        snapshot = load_snapshot(mock_db)
+        assert format_sentiment_section(mock_db, snapshot=snapshot) == format_sentiment_section(mock_db)
+
+
+class TestTechnicalTally:
+    """Brief technical line counts signal directions in a single pass."""
+
+    def test_counts_graded_signals(self, mock_db):
+        mock_db.set_table_data("technical_indicators", [
+            {"indicator": "RSI_14", "date": "2026-02-06", "value": "82", "signal": "extreme_bearish"},
+            {"indicator": "MACD", "date": "2026-02-06", "value": "120", "signal": "bullish"},
+            {"indicator": "SMA_CROSS", "date": "2026-02-06", "value": "5000", "signal": "strong_bullish"},
+            {"indicator": "ATR_14", "date": "2026-02-06", "value": "900", "signal": "neutral"},
+        ])
+        result = format_technical_section(mock_db)
+        assert "2 bullish, 1 bearish" in result
+        assert "RSI_14: extreme_bearish" in result
+
+
+class TestMacroStrength:
+    """Detailed macro section buckets correlations by magnitude."""
+
+    def test_bucket_boundaries(self, mock_db):
+        mock_db.set_table_data("technical_indicators", [
+            {"indicator": "CORR_BTC_SPX_30D", "date": "2026-02-06", "value": "0.6"},
+            {"indicator": "CORR_BTC_GOLD_30D", "date": "2026-02-06", "value": "-0.61"},
+            {"indicator": "CORR_BTC_DXY_30D", "date": "2026-02-06", "value": "0.3"},
+        ])
+        result = format_macro_section(mock_db, brief=False)
+        assert "SPX 30D:** +0.6000 (positive moderate)" in result
+        assert "GOLD 30D:** -0.6100 (negative strong)" in result
+        assert "DXY 30D:** +0.3000 (positive weak)" in result
+
+
+class TestConclusionsPreview:
+    """Conclusions come from the trimmed preview view, with a table fallback."""
+
+    def test_reads_preview_view(self, mock_db):
+        mock_db.set_table_data("conclusions_preview", [
+            {"title": "From view", "content": "short", "category": "macro",
+             "confidence": 6, "status": "active"},
+        ])
+        assert "From view" in format_conclusions_section(mock_db)
+
+    def test_falls_back_without_view(self, mock_db):
+        table = mock_db.table
+
+        def no_view(name):
+            if name == "conclusions_preview":
+                raise APIError({"code": "PGRST205", "message": "Could not find the table"})
+            return table(name)
+
+        mock_db.table = no_view
+        assert "BTC in mid-bull phase" in format_conclusions_section(mock_db)
+
+    def test_other_errors_raised(self, mock_db):
+        table = mock_db.table
+
+        def denied(name):
+            if name == "conclusions_preview":
+                raise APIError({"code": "42501", "message": "permission denied"})
+            return table(name)
+
+        mock_db.table = denied
+        with pytest.raises(APIError):
+            format_conclusions_section(mock_db)
+
+
+class TestCompareSnapshot:
+    """Compare uses the compare_snapshot RPC when deployed, else table queries."""
+
+    def test_uses_rpc(self, mock_db):
+        mock_db.set_rpc_result("compare_snapshot", {
+            "d1": {"price": {"close": 90000}, "rsi": None, "cycle": None, "sentiment": {"value": 30}},
+            "d2": {"price": {"close": 98000}, "rsi": {"value": 55.3, "signal": "bullish"},
+                   "cycle": {"score": 62, "phase": "mid_bull"}, "sentiment": {"value": 65}},
+        })
+        result = format_compare_section(mock_db, "2026-01-06", "2026-02-06")
+        assert "Price (2026-01-06): $90,000.00" in result
+        assert "RSI (2026-02-06): 55.3 — bullish" in result
+        assert "RSI (2026-01-06)" not in result
+        assert "Fear & Greed (2026-01-06): 30" in result
+
+    def test_falls_back_to_tables(self, mock_db):
+        result = format_compare_section(mock_db, "2026-01-06", "2026-02-06")
+        assert "Price (2026-02-06): $98,000.00" in result
+        assert "Score (2026-02-06): 62/100 — mid_bull" in result
+
+
+class TestFearGreedLabels:
+    """Fear & Greed labels come from a precomputed 0-100 table."""
+
+    def test_band_edges(self):
+        assert _FG_LABELS[20] == "Extreme Fear"
+        assert _FG_LABELS[21] == "Fear"
+        assert _FG_LABELS[60] == "Neutral"
+        assert _FG_LABELS[80] == "Greed"
+        assert _FG_LABELS[81] == "Extreme Greed"
+
+    def test_out_of_range_values_are_clamped(self, mock_db):
+        mock_db.set_table_data("sentiment_data", [
+            {"metric": "FEAR_GREED", "date": "2026-02-06", "value": "104"},
+        ])
+        assert "(Extreme Greed)" in format_sentiment_section(mock_db)
+
+
+class TestSignalChangeSnapshot:
+    """Signal changes come from one RPC call when it is deployed."""
+
+    def test_uses_rpc(self, mock_db):
+        mock_db.set_rpc_result("signal_change_snapshot", [
+            {"indicator": "RSI_14", "today_sig": "bearish", "yest_sig": "neutral"},
+            {"indicator": "MACD", "today_sig": "bullish", "yest_sig": "bullish"},
+            {"indicator": "SMA_CROSS", "today_sig": "bullish", "yest_sig": None},
+        ])
+        result = format_signal_changes(mock_db, as_of=date(2026, 2, 6))
+        assert "- **RSI_14:** neutral -> bearish" in result
+        assert "MACD" not in result
+        assert "SMA_CROSS" not in result
+
+
+class TestRenderCache:
+    """Section renders are reused until the TTL expires or data lands."""
+
+    def test_repeat_render_served_from_cache(self, mock_db):
+        first = format_price_section(mock_db)
+        mock_db.set_table_data("btc_prices", [{"date": "2026-02-07", "close": "1"}])
+        assert format_price_section(mock_db) == first
+
+    def test_bump_version_invalidates(self, mock_db):
+        first = format_price_section(mock_db)
+        mock_db.set_table_data("btc_prices", [{"date": "2026-02-07", "close": "1"}])
+        bump_version()
+        assert format_price_section(mock_db) != first
+
+    def test_snapshot_calls_bypass_cache(self, mock_db):
+        format_sentiment_section(mock_db)
+        mock_db.set_table_data("sentiment_data", [
+            {"metric": "FEAR_GREED", "date": "2026-02-07", "value": "10"},
+        ])
+        snapshot = ContextSnapshot(sentiment={"FEAR_GREED": {"value": "10"}})
+        assert "(Extreme Fear)" in format_sentiment_section(mock_db, snapshot=snapshot)
+
+
+class TestSentimentSingleQuery:
+    """Detailed sentiment reads current values and 7d history together."""
+
+    def test_week_change_from_shared_rows(self, mock_db):
+        rows = [
+            {"metric": "FEAR_GREED", "date": f"2026-02-{6 - i:02d}", "value": str(70 - i * 2)}
+            for i in range(6)
+        ] + [
+            {"metric": "FEAR_GREED", "date": "2026-01-31", "value": "50"},
+            {"metric": "FEAR_GREED_30D", "date": "2026-02-06", "value": "58.5"},
+        ]
+        mock_db.set_table_data("sentiment_data", rows)
+        result = format_sentiment_section(mock_db, brief=False)
+        assert "**Fear & Greed 30d MA:** 58.5" in result
+        assert "**7d Change:** +20 (from 50 to 70)" in result
+
+
+class TestProjections:
+    """Context queries project explicit columns, never select("*")."""
+
+    def test_no_wildcard_selects(self):
+        context_dir = Path(__file__).resolve().parent.parent / "btc_intel" / "context"
+        offenders = [
+            p.name for p in context_dir.glob("*.py")
+            if 'select("*")' in p.read_text(encoding="utf-8")
+        ]
+        assert offenders == []
+
+
+class TestGather:
+    """Fanned-out queries come back in the order they were submitted."""
+
+    def test_keeps_call_order(self):
+        assert gather([lambda i=i: i * i for i in range(10)]) == [i * i for i in range(10)]
@@ -0,0 +1,63 @@
+"""Tests for the shared loader HTTP client."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from btc_intel.data.http_client import TokenBucket, close_client, get_client, response_json
+
+
+class TestSharedClient:
+    @pytest.mark.asyncio
+    async def test_reused_within_loop(self):
+        try:
+            assert get_client() is get_client()
+        finally:
+            await close_client()
+
+    @pytest.mark.asyncio
+    async def test_rebuilt_after_close(self):
+        first = get_client()
+        await close_client()
+        assert first.is_closed
+        second = get_client()
+        assert second is not first
+        await close_client()
+
+    def test_rebuilt_for_new_loop(self):
+        async def grab():
+            return get_client()
+
+        first = asyncio.run(grab())
+        second = asyncio.run(grab())
+        assert second is not first
+        asyncio.run(close_client())
+
+
+class TestResponseJson:
+    def test_decodes_body(self):
+        resp = httpx.Response(200, content=b'{"data": [{"fundingRate": "0.0001"}]}')
+        assert response_json(resp) == {"data": [{"fundingRate": "0.0001"}]}
+
+
+class TestTokenBucket:
+    @pytest.mark.asyncio
+    async def test_burst_within_capacity_does_not_wait(self):
+        bucket = TokenBucket(rate=1, capacity=3)
+        start = time.monotonic()
+        for _ in range(3):
+            async with bucket:
+                pass
+        assert time.monotonic() - start < 0.1
+
+    @pytest.mark.asyncio
+    async def test_over_budget_waits_for_refill(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+        for _ in range(3):
+            async with bucket:
+                pass
+        # Two extra requests at 50/s need ~40 ms of refill
+        assert time.monotonic() - start >= 0.035
@@ -0,0 +1,95 @@
+"""Tests for the HTTP retry helpers."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from btc_intel.data.retry import (
+    MAX_PER_HOST,
+    MAX_RETRY_AFTER,
+    _backoff,
+    async_get_with_retry,
+)
+
+
+def _client(statuses: list[int], headers: dict | None = None) -> tuple[httpx.AsyncClient, list]:
+    """Client answering with ``statuses`` in order; also returns the list of requests seen."""
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(statuses[len(seen) - 1], headers=headers or {}, json={})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), seen
+
+
+class TestBackoff:
+    def test_jitter_within_exponential_cap(self):
+        for attempt in range(4):
+            for _ in range(50):
+                assert 0 <= _backoff(attempt, 1) <= 2 ** attempt
+
+    def test_retry_after_seconds_is_a_floor(self):
+        resp = httpx.Response(429, headers={"Retry-After": "7"})
+        assert _backoff(0, 1, resp) == 7
+
+    def test_retry_after_over_limit_gives_up(self):
+        resp = httpx.Response(429, headers={"Retry-After": str(MAX_RETRY_AFTER + 1)})
+        assert _backoff(0, 1, resp) is None
+
+    def test_unparseable_retry_after_ignored(self):
+        resp = httpx.Response(503, headers={"Retry-After": "soon"})
+        assert 0 <= _backoff(0, 1, resp) <= 1
+
+
+class TestAsyncGetWithRetry:
+    @pytest.mark.asyncio
+    async def test_retries_rate_limit(self):
+        client, seen = _client([429, 200])
+        async with client:
+            resp = await async_get_with_retry(client, "https://example.com", base_delay=0)
+        assert resp.status_code == 200
+        assert len(seen) == 2
+
+    @pytest.mark.asyncio
+    async def test_retries_server_error(self):
+        client, seen = _client([503, 502, 200])
+        async with client:
+            resp = await async_get_with_retry(client, "https://example.com", base_delay=0)
+        assert resp.status_code == 200
+        assert len(seen) == 3
+
+    @pytest.mark.asyncio
+    async def test_long_retry_after_raises_at_once(self):
+        client, seen = _client([429, 200], headers={"Retry-After": "3600"})
+        async with client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await async_get_with_retry(client, "https://example.com", base_delay=0)
+        assert len(seen) == 1
+
+    @pytest.mark.asyncio
+    async def test_client_error_not_retried(self):
+        client, seen = _client([404])
+        async with client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await async_get_with_retry(client, "https://example.com", base_delay=0)
+        assert len(seen) == 1
+
+    @pytest.mark.asyncio
+    async def test_in_flight_capped_per_host(self):
+        in_flight = peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await asyncio.gather(*(
+                async_get_with_retry(client, f"https://example.com/{i}") for i in range(12)
+            ))
+        assert peak == MAX_PER_HOST
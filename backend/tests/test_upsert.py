@@ -0,0 +1,83 @@
+"""Tests for batched loader upserts."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from btc_intel.data.upsert import _pg_value, bulk_upsert, series_rows, upsert_batches, upsert_rows
+
+
+class _FailingBatchClient:
+    """Records upserted batches; the batch starting with ``fail_on`` raises."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.batches: list[list[dict]] = []
+
+    def table(self, _name):
+        return self
+
+    def upsert(self, batch, on_conflict=None):
+        return _Exec(self, batch)
+
+
+class _Exec:
+    def __init__(self, client, batch):
+        self.client, self.batch = client, batch
+
+    def execute(self):
+        if self.batch[0]["id"] == self.client.fail_on:
+            raise RuntimeError("conflict")
+        self.client.batches.append(self.batch)
+
+
+@pytest.mark.asyncio
+async def test_all_batches_written():
+    client = _FailingBatchClient()
+    rows = [{"id": i} for i in range(1200)]
+    assert await upsert_batches(client, "t", rows, on_conflict="id", batch_size=500) == 1200
+    assert sorted(len(b) for b in client.batches) == [200, 500, 500]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_skipped():
+    client = _FailingBatchClient(fail_on=500)
+    rows = [{"id": i} for i in range(1200)]
+    assert await upsert_batches(client, "t", rows, on_conflict="id", batch_size=500) == 700
+
+
+def test_sync_batches_in_order():
+    client = _FailingBatchClient()
+    rows = [{"id": i} for i in range(1200)]
+    assert upsert_rows(client, "t", rows, on_conflict="id", batch_size=500) == 1200
+    assert [b[0]["id"] for b in client.batches] == [0, 500, 1000]
+
+
+def test_sync_error_propagates():
+    client = _FailingBatchClient(fail_on=500)
+    with pytest.raises(RuntimeError):
+        upsert_rows(client, "t", [{"id": i} for i in range(1200)], on_conflict="id",
+                    batch_size=500)
+
+
+@pytest.mark.asyncio
+async def test_bulk_needs_database_url(monkeypatch):
+    monkeypatch.setattr("btc_intel.data.upsert.settings.database_url", "")
+    assert await bulk_upsert("onchain_metrics", [{"date": "2026-02-06"}], "date") is None
+
+
+def test_copy_values_are_typed():
+    assert _pg_value("date", "2026-02-06") == date(2026, 2, 6)
+    assert _pg_value("value", 1.5) == Decimal("1.5")
+    assert _pg_value("metric", "NVT_RATIO") == "NVT_RATIO"
+    assert _pg_value("volume", None) is None
+
+
+def test_series_rows_adds_constant_fields():
+    rows = series_rows(["2026-02-05", "2026-02-06"], [1.5, 2.0], metric="HASH_RATE",
+                       source="blockchain_com")
+    assert rows == [
+        {"date": "2026-02-05", "value": 1.5, "metric": "HASH_RATE", "source": "blockchain_com"},
+        {"date": "2026-02-06", "value": 2.0, "metric": "HASH_RATE", "source": "blockchain_com"},
+    ]
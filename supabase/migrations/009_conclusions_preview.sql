@@ -0,0 +1,18 @@
+-- ============================================================
+-- BTC Intelligence Hub — Conclusions preview
+-- Context briefings only show the first 150 chars of each conclusion;
+-- this view trims content server-side so full texts never cross the wire.
+-- Ejecutar en Supabase Dashboard > SQL Editor
+-- ============================================================
+
+CREATE OR REPLACE VIEW btc_hub.conclusions_preview
+WITH (security_invoker = true) AS
+SELECT
+    id,
+    title,
+    left(content, 150) AS content,
+    category,
+    confidence,
+    status,
+    created_at
+FROM btc_hub.conclusions;
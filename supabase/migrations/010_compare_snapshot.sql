@@ -0,0 +1,43 @@
+-- ============================================================
+-- BTC Intelligence Hub — compare_snapshot RPC
+-- Returns price, RSI, cycle score and Fear & Greed as of two dates
+-- in one round-trip for the context "compare" scope.
+-- Ejecutar en Supabase Dashboard > SQL Editor
+-- ============================================================
+
+CREATE OR REPLACE FUNCTION btc_hub.compare_point(d DATE)
+RETURNS JSONB
+LANGUAGE sql STABLE
+SET search_path = btc_hub
+AS $$
+    SELECT jsonb_build_object(
+        'price', (
+            SELECT jsonb_build_object('close', close)
+            FROM btc_prices WHERE date <= d
+            ORDER BY date DESC LIMIT 1
+        ),
+        'rsi', (
+            SELECT jsonb_build_object('value', value, 'signal', signal)
+            FROM technical_indicators WHERE indicator = 'RSI_14' AND date <= d
+            ORDER BY date DESC LIMIT 1
+        ),
+        'cycle', (
+            SELECT jsonb_build_object('score', score, 'phase', phase)
+            FROM cycle_score_history WHERE date <= d
+            ORDER BY date DESC LIMIT 1
+        ),
+        'sentiment', (
+            SELECT jsonb_build_object('value', value)
+            FROM sentiment_data WHERE metric = 'FEAR_GREED' AND date <= d
+            ORDER BY date DESC LIMIT 1
+        )
+    );
+$$;
+
+CREATE OR REPLACE FUNCTION btc_hub.compare_snapshot(d1 DATE, d2 DATE)
+RETURNS JSONB
+LANGUAGE sql STABLE
+SET search_path = btc_hub
+AS $$
+    SELECT jsonb_build_object('d1', compare_point(d1), 'd2', compare_point(d2));
+$$;
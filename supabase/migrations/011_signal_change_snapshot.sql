@@ -0,0 +1,27 @@
+-- ============================================================
+-- BTC Intelligence Hub — signal_change_snapshot RPC
+-- Latest signal on or before `day` and on or before the previous day,
+-- for several indicators in one round-trip (morning "changes" section).
+-- Ejecutar en Supabase Dashboard > SQL Editor
+-- ============================================================
+
+CREATE OR REPLACE FUNCTION btc_hub.signal_change_snapshot(day DATE, indicators TEXT[])
+RETURNS TABLE (indicator TEXT, today_sig TEXT, yest_sig TEXT)
+LANGUAGE sql STABLE
+SET search_path = btc_hub
+AS $$
+    SELECT
+        ind,
+        (
+            SELECT t.signal FROM technical_indicators t
+            WHERE t.indicator = ind AND t.date <= day
+            ORDER BY t.date DESC LIMIT 1
+        ),
+        (
+            SELECT t.signal FROM technical_indicators t
+            WHERE t.indicator = ind AND t.date <= day - 1
+            ORDER BY t.date DESC LIMIT 1
+        )
+    FROM unnest(indicators) WITH ORDINALITY AS u(ind, ord)
+    ORDER BY ord;
+$$;
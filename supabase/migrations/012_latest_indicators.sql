@@ -0,0 +1,29 @@
+-- ============================================================
+-- BTC Intelligence Hub — latest_indicators RPC
+-- Latest row per indicator (optionally as of a date) in one round-trip,
+-- replacing one limit-1 query per indicator in the context formatters.
+-- Ejecutar en Supabase Dashboard > SQL Editor
+-- ============================================================
+
+-- Covering index: each lookup is a single index-only probe
+CREATE INDEX IF NOT EXISTS idx_tech_indicator_date_cover
+ON btc_hub.technical_indicators(indicator, date DESC) INCLUDE (value, signal);
+
+-- One LATERAL probe per name is the DISTINCT ON (indicator) result without
+-- scanning each indicator's full history.
+CREATE OR REPLACE FUNCTION btc_hub.latest_indicators(names TEXT[], as_of DATE DEFAULT NULL)
+RETURNS TABLE (indicator VARCHAR, value DECIMAL, signal VARCHAR, date DATE)
+LANGUAGE sql STABLE
+SET search_path = btc_hub
+AS $$
+    SELECT t.indicator, t.value, t.signal, t.date
+    FROM unnest(names) AS n(name)
+    CROSS JOIN LATERAL (
+        SELECT ti.indicator, ti.value, ti.signal, ti.date
+        FROM technical_indicators ti
+        WHERE ti.indicator = n.name
+          AND (as_of IS NULL OR ti.date <= as_of)
+        ORDER BY ti.date DESC
+        LIMIT 1
+    ) t;
+$$;
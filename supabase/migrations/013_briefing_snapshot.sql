@@ -0,0 +1,62 @@
+-- ============================================================
+-- BTC Intelligence Hub — get_briefing_snapshot RPC
+-- Every slice the summary/morning context formatters read, as one JSONB
+-- document, so a briefing needs a single round-trip for its latest data.
+-- Ejecutar en Supabase Dashboard > SQL Editor
+-- ============================================================
+
+CREATE OR REPLACE FUNCTION btc_hub.get_briefing_snapshot(
+    tech_keys TEXT[],
+    onchain_keys TEXT[],
+    sentiment_keys TEXT[]
+)
+RETURNS JSONB
+LANGUAGE sql STABLE
+SET search_path = btc_hub
+AS $$
+    SELECT jsonb_build_object(
+        'prices', (
+            SELECT coalesce(jsonb_agg(p ORDER BY p.date DESC), '[]'::jsonb)
+            FROM (SELECT date, close FROM btc_prices ORDER BY date DESC LIMIT 31) p
+        ),
+        'cycle', (
+            SELECT coalesce(jsonb_agg(c ORDER BY c.date DESC), '[]'::jsonb)
+            FROM (
+                SELECT date, score, phase FROM cycle_score_history
+                ORDER BY date DESC LIMIT 2
+            ) c
+        ),
+        'tech', (
+            SELECT coalesce(jsonb_object_agg(t.indicator, to_jsonb(t)), '{}'::jsonb)
+            FROM unnest(tech_keys) AS k(name)
+            CROSS JOIN LATERAL (
+                SELECT indicator, value, signal, date FROM technical_indicators
+                WHERE indicator = k.name ORDER BY date DESC LIMIT 1
+            ) t
+        ),
+        'onchain', (
+            SELECT coalesce(jsonb_object_agg(o.metric, to_jsonb(o)), '{}'::jsonb)
+            FROM unnest(onchain_keys) AS k(name)
+            CROSS JOIN LATERAL (
+                SELECT metric, value, signal, date FROM onchain_metrics
+                WHERE metric = k.name ORDER BY date DESC LIMIT 1
+            ) o
+        ),
+        'sentiment', (
+            SELECT coalesce(jsonb_object_agg(s.metric, to_jsonb(s)), '{}'::jsonb)
+            FROM unnest(sentiment_keys) AS k(name)
+            CROSS JOIN LATERAL (
+                SELECT metric, value, date FROM sentiment_data
+                WHERE metric = k.name ORDER BY date DESC LIMIT 1
+            ) s
+        ),
+        'alerts', (
+            SELECT coalesce(jsonb_agg(a ORDER BY a.date DESC), '[]'::jsonb)
+            FROM (
+                SELECT date, type, severity, title, description, signal FROM alerts
+                WHERE acknowledged = false
+                ORDER BY date DESC LIMIT 10
+            ) a
+        )
+    );
+$$;
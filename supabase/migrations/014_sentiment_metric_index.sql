@@ -0,0 +1,9 @@
+-- ============================================================
+-- BTC Intelligence Hub — sentiment_data (metric, date DESC) index
+-- Serves the "latest N rows for these metrics" lookups of the context
+-- sentiment section (metric IN (...) ORDER BY date DESC).
+-- Ejecutar en Supabase Dashboard > SQL Editor
+-- ============================================================
+
+CREATE INDEX IF NOT EXISTS idx_sentiment_metric_date
+ON btc_hub.sentiment_data(metric, date DESC);
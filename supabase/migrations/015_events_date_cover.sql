@@ -0,0 +1,10 @@
+-- ============================================================
+-- BTC Intelligence Hub — covering index for upcoming events
+-- The context "Upcoming Events" section reads date,title,category,impact
+-- for a 7-day window; including those columns lets Postgres answer it
+-- with an index-only range scan.
+-- Ejecutar en Supabase Dashboard > SQL Editor
+-- ============================================================
+
+CREATE INDEX IF NOT EXISTS idx_events_date_cover
+ON btc_hub.events(date) INCLUDE (title, category, impact);
@@ -0,0 +1,13 @@
+-- ============================================================
+-- BTC Intelligence Hub — natural keys for seeded tables
+-- seed_cycles / seed_events upsert their whole list in one request
+-- with ON CONFLICT DO NOTHING, which needs a unique index to target.
+-- Remove any duplicate rows (same name / same date+title) before running.
+-- Ejecutar en Supabase Dashboard > SQL Editor
+-- ============================================================
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_cycles_name_unique
+ON btc_hub.cycles(name);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_events_date_title_unique
+ON btc_hub.events(date, title);
@@ -0,0 +1,41 @@
+-- ============================================================
+-- BTC Intelligence Hub — latest_dates RPC
+-- Last stored date per asset / metric in one round-trip, replacing one
+-- limit-1 query per series when the loaders resume incrementally.
+-- Ejecutar en Supabase Dashboard > SQL Editor
+-- ============================================================
+
+-- (key, date) indexes so each max(date) is a single index probe
+CREATE INDEX IF NOT EXISTS idx_macro_asset_date
+ON btc_hub.macro_data(asset, date DESC);
+
+CREATE INDEX IF NOT EXISTS idx_onchain_metric_date
+ON btc_hub.onchain_metrics(metric, date DESC);
+
+-- sentiment_data(metric, date) is covered by idx_sentiment_metric_date (014)
+
+CREATE OR REPLACE FUNCTION btc_hub.latest_dates(tbl TEXT, keys TEXT[])
+RETURNS TABLE (key TEXT, date DATE)
+LANGUAGE plpgsql STABLE
+SET search_path = btc_hub
+AS $$
+DECLARE
+    key_col TEXT;
+BEGIN
+    -- Table names cannot be parameters; only the loader tables are accepted
+    key_col := CASE tbl
+        WHEN 'macro_data' THEN 'asset'
+        WHEN 'onchain_metrics' THEN 'metric'
+        WHEN 'sentiment_data' THEN 'metric'
+    END;
+    IF key_col IS NULL THEN
+        RAISE EXCEPTION 'latest_dates: unsupported table %', tbl;
+    END IF;
+
+    RETURN QUERY EXECUTE format(
+        'SELECT n.k, (SELECT max(t.date) FROM %I t WHERE t.%I = n.k)
+         FROM unnest($1) AS n(k)',
+        tbl, key_col
+    ) USING keys;
+END;
+$$;
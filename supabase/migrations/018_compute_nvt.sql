@@ -0,0 +1,28 @@
+-- ============================================================
+-- BTC Intelligence Hub — compute_nvt RPC
+-- NVT_RATIO = MARKET_CAP / TRANSACTION_COUNT, joined and upserted inside
+-- Postgres instead of downloading both series to the loader and uploading
+-- the result. Returns the number of NVT rows written.
+-- Ejecutar en Supabase Dashboard > SQL Editor
+-- ============================================================
+
+CREATE OR REPLACE FUNCTION btc_hub.compute_nvt(since_date DATE DEFAULT NULL)
+RETURNS INTEGER
+LANGUAGE sql VOLATILE
+SET search_path = btc_hub
+AS $$
+    WITH written AS (
+        INSERT INTO onchain_metrics (date, metric, value, source)
+        SELECT mc.date, 'NVT_RATIO', round(mc.value / tx.value, 8), 'calculated'
+        FROM onchain_metrics mc
+        JOIN onchain_metrics tx
+          ON tx.date = mc.date AND tx.metric = 'TRANSACTION_COUNT'
+        WHERE mc.metric = 'MARKET_CAP'
+          AND tx.value <> 0
+          AND (since_date IS NULL OR mc.date >= since_date)
+        ON CONFLICT (date, metric) DO UPDATE
+        SET value = EXCLUDED.value, source = EXCLUDED.source
+        RETURNING 1
+    )
+    SELECT count(*)::INTEGER FROM written;
+$$;